@@ -1,63 +1,219 @@
 """
 Books API endpoints
 """
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.ext.asyncio import AsyncSession
-from typing import Optional
-from config.database import get_database_session
-from controllers.book_controller import BookController
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from typing import Optional, Any
+from uuid import UUID
+from config.settings import settings
+from controllers.book_repository import BookRepository, get_book_repository
+from controllers.book_queries import InvalidCursorError
+from controllers.list_cache import list_cache
 from schemas.book_schema import (
     BookCreate, 
     BookUpdate, 
     BookListResponse, 
     BookSingleResponse,
+    BookSuggestListResponse,
+    BookBulkUpdate,
+    BookBulkDelete,
+    BookBulkResponse,
+    BookSort,
     ErrorResponse
 )
 
 router = APIRouter(prefix="/api/v1/books", tags=["Books"])
 
+async def list_books(request: Request, repository: BookRepository, **params) -> Any:
+    """
+    Run a list query and build the response (shared by the list routes)
+    
+    `params` are the BookRepository.get_books keyword arguments.
+    """
+    if params.get("sort") == BookSort.relevance.value and not params.get("q"):
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "success": False,
+                "error": "sort=relevance requires a search query (q)",
+                "code": 400
+            }
+        )
+    
+    # Validate price range
+    min_price, max_price = params.get("min_price"), params.get("max_price")
+    if min_price is not None and max_price is not None and min_price > max_price:
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "success": False,
+                "error": "min_price cannot be greater than max_price",
+                "code": 400
+            }
+        )
+    
+    try:
+        if settings.LIST_CACHE_ENABLED:
+            # Serve ready-to-send bytes for repeated parameter combinations
+            key = list_cache.make_key(**params)
+            entry = list_cache.get(key)
+            if entry is None:
+                generation = list_cache.generation
+                result = await repository.get_books(**params)
+                body = BookListResponse(
+                    success=True,
+                    data=result["books"],
+                    pagination=result["pagination"]
+                ).model_dump_json().encode()
+                entry = list_cache.put(key, body, generation)
+            return list_cache.response(entry, request.headers.get("accept-encoding"))
+        
+        result = await repository.get_books(**params)
+        
+        return {
+            "success": True,
+            "data": result["books"],
+            "pagination": result["pagination"]
+        }
+        
+    except InvalidCursorError as e:
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "success": False,
+                "error": str(e),
+                "code": 400
+            }
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail={
+                "success": False,
+                "error": str(e),
+                "code": 500
+            }
+        )
+
 @router.get(
     "/",
     response_model=BookListResponse,
     summary="Get books with pagination and filters",
-    description="Retrieve books with support for pagination, search, and filtering by author and price range"
+    description="Retrieve books with support for pagination (offset or keyset cursor), sorting, search, and filtering by author, owner and price range"
 )
 async def get_books(
+    request: Request,
     page: int = Query(1, ge=1, description="Page number (starts at 1)"),
     limit: int = Query(10, ge=1, le=100, description="Items per page (max 100)"),
+    cursor: Optional[str] = Query(None, max_length=2000, description="Keyset cursor (pagination.next_cursor of the previous page); replaces page"),
+    sort: BookSort = Query(BookSort.created_at, description="Sort order (relevance requires q)"),
     q: Optional[str] = Query(None, description="Search query (searches in name, author, description)"),
     author: Optional[str] = Query(None, description="Filter by author"),
+    id_user: Optional[UUID] = Query(None, description="Filter by owner user ID"),
     min_price: Optional[float] = Query(None, ge=0, description="Minimum price filter"),
     max_price: Optional[float] = Query(None, ge=0, description="Maximum price filter"),
-    db: AsyncSession = Depends(get_database_session)
+    repository: BookRepository = Depends(get_book_repository)
 ):
     """Get books with pagination, search and filters"""
+    return await list_books(
+        request,
+        repository,
+        page=page,
+        limit=limit,
+        cursor=cursor,
+        sort=sort.value,
+        q=q,
+        author=author,
+        id_user=str(id_user) if id_user else None,
+        min_price=min_price,
+        max_price=max_price
+    )
+
+@router.post(
+    "/bulk/update",
+    response_model=BookBulkResponse,
+    summary="Bulk update books",
+    description="Apply the same patch to books selected by an ID list or by the list filters (chunked, with dry-run count)"
+)
+async def bulk_update_books(
+    bulk_data: BookBulkUpdate,
+    repository: BookRepository = Depends(get_book_repository)
+):
+    """Apply a patch to many books"""
+    if not bulk_data.patch.model_dump(exclude_unset=True):
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "success": False,
+                "error": "patch must set at least one field",
+                "code": 400
+            }
+        )
+    
     try:
-        # Validate price range
-        if min_price is not None and max_price is not None and min_price > max_price:
-            raise HTTPException(
-                status_code=400,
-                detail={
-                    "success": False,
-                    "error": "min_price cannot be greater than max_price",
-                    "code": 400
-                }
-            )
+        result = await repository.bulk_update(bulk_data)
         
-        result = await BookController.get_books(
-            db=db,
-            page=page,
-            limit=limit,
-            q=q,
-            author=author,
-            min_price=min_price,
-            max_price=max_price
+        return {
+            "success": True,
+            "data": result
+        }
+        
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail={
+                "success": False,
+                "error": str(e),
+                "code": 500
+            }
         )
+
+@router.post(
+    "/bulk/delete",
+    response_model=BookBulkResponse,
+    summary="Bulk delete books",
+    description="Soft delete books selected by an ID list or by the list filters (chunked, with dry-run count)"
+)
+async def bulk_delete_books(
+    bulk_data: BookBulkDelete,
+    repository: BookRepository = Depends(get_book_repository)
+):
+    """Soft delete many books"""
+    try:
+        result = await repository.bulk_delete(bulk_data)
         
         return {
             "success": True,
-            "data": result["books"],
-            "pagination": result["pagination"]
+            "data": result
+        }
+        
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail={
+                "success": False,
+                "error": str(e),
+                "code": 500
+            }
+        )
+
+@router.get(
+    "/suggest",
+    response_model=BookSuggestListResponse,
+    summary="Typeahead suggestions for titles and authors",
+    description="Return the top title and author completions for a prefix (case and accent insensitive)"
+)
+async def suggest_books(
+    prefix: str = Query(..., min_length=1, max_length=100, description="Text typed so far"),
+    limit: int = Query(5, ge=1, le=20, description="Maximum suggestions (max 20)"),
+    repository: BookRepository = Depends(get_book_repository)
+):
+    """Get title and author completions for a prefix"""
+    try:
+        suggestions = await repository.suggest(prefix, limit)
+        
+        return {
+            "success": True,
+            "data": suggestions
         }
         
     except Exception as e:
@@ -78,11 +234,11 @@ async def get_books(
 )
 async def get_book(
     book_id: str,
-    db: AsyncSession = Depends(get_database_session)
+    repository: BookRepository = Depends(get_book_repository)
 ):
     """Get a single book by UUID"""
     try:
-        book = await BookController.get_book_by_id(db, book_id)
+        book = await repository.get_book_by_id(book_id)
         
         if not book:
             raise HTTPException(
@@ -120,11 +276,11 @@ async def get_book(
 )
 async def create_book(
     book_data: BookCreate,
-    db: AsyncSession = Depends(get_database_session)
+    repository: BookRepository = Depends(get_book_repository)
 ):
     """Create a new book"""
     try:
-        book = await BookController.create_book(db, book_data)
+        book = await repository.create_book(book_data)
         
         return {
             "success": True,
@@ -150,11 +306,11 @@ async def create_book(
 async def update_book(
     book_id: str,
     book_data: BookUpdate,
-    db: AsyncSession = Depends(get_database_session)
+    repository: BookRepository = Depends(get_book_repository)
 ):
     """Update an existing book"""
     try:
-        book = await BookController.update_book(db, book_id, book_data)
+        book = await repository.update_book(book_id, book_data)
         
         if not book:
             raise HTTPException(
@@ -190,11 +346,11 @@ async def update_book(
 )
 async def delete_book(
     book_id: str,
-    db: AsyncSession = Depends(get_database_session)
+    repository: BookRepository = Depends(get_book_repository)
 ):
     """Soft delete a book"""
     try:
-        deleted = await BookController.delete_book(db, book_id)
+        deleted = await repository.delete_book(book_id)
         
         if not deleted:
             raise HTTPException(
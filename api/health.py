@@ -2,16 +2,16 @@
 Health check endpoint
 """
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import text
-from config.database import get_database_session
+from config.log_config import dropped_records
 from config.settings import settings
+from controllers.book_repository import BookRepository, get_book_repository
+from controllers.list_cache import list_cache
 from datetime import datetime, timezone
 
 router = APIRouter(prefix="/api/v1", tags=["Health"])
 
 @router.get("/health")
-async def health_check(db: AsyncSession = Depends(get_database_session)):
+async def health_check(repository: BookRepository = Depends(get_book_repository)):
     """
     Health check endpoint to verify API and database connectivity
     
@@ -19,15 +19,18 @@ async def health_check(db: AsyncSession = Depends(get_database_session)):
         JSON response with API status and database connectivity
     """
     try:
-        # Test database connection
-        await db.execute(text("SELECT 1"))
+        # Test database connection (no-op for the in-memory repository)
+        backend = await repository.ping()
         
         return {
             "success": True,
             "message": "Books API is running",
             "timestamp": datetime.now(timezone.utc).isoformat(),
             "environment": settings.APP_ENV,
-            "database": "connected",
+            "database": "connected" if settings.uses_database else "not used",
+            "repository": backend,
+            # Log records discarded because the logging queue was full
+            "log_records_dropped": dropped_records(),
             "version": "1.0.0"
         }
         
@@ -40,4 +43,17 @@ async def health_check(db: AsyncSession = Depends(get_database_session)):
                 "message": str(e),
                 "code": 503
             }
-        )
\ No newline at end of file
+        )
+
+@router.get("/health/cache")
+async def cache_metrics():
+    """
+    List result cache metrics
+    
+    Returns:
+        JSON response with hit ratio, size and invalidation counters
+    """
+    return {
+        "success": True,
+        "data": list_cache.stats()
+    }
@@ -0,0 +1,39 @@
+"""
+User-scoped API endpoints
+"""
+from fastapi import APIRouter, Depends, Query, Request
+from typing import Optional
+from uuid import UUID
+from api.books import list_books
+from controllers.book_repository import BookRepository, get_book_repository
+from schemas.book_schema import BookListResponse, BookSort
+
+router = APIRouter(prefix="/api/v1/users", tags=["Users"])
+
+@router.get(
+    "/{id_user}/books",
+    response_model=BookListResponse,
+    summary="Get books owned by a user",
+    description="Retrieve a user's books, newest first by default, with sorting and keyset cursor or offset pagination (served by the owner index; totals only on request)"
+)
+async def get_user_books(
+    request: Request,
+    id_user: UUID,
+    page: int = Query(1, ge=1, description="Page number (starts at 1)"),
+    limit: int = Query(10, ge=1, le=100, description="Items per page (max 100)"),
+    cursor: Optional[str] = Query(None, max_length=2000, description="Keyset cursor (pagination.next_cursor of the previous page); replaces page"),
+    sort: BookSort = Query(BookSort.created_at, description="Sort order (relevance is not available here)"),
+    include_total: bool = Query(False, description="Count the user's books for total/total_pages (offset pages only)"),
+    repository: BookRepository = Depends(get_book_repository)
+):
+    """Get a user's books"""
+    return await list_books(
+        request,
+        repository,
+        page=page,
+        limit=limit,
+        cursor=cursor,
+        sort=sort.value,
+        id_user=str(id_user),
+        with_total=include_total
+    )
@@ -1,30 +1,76 @@
 """
 Database connection and session management
+
+The engine is created lazily on first use, so importing this module (and
+`main`) neither loads the asyncpg driver nor touches the network.
 """
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+import asyncio
+from typing import Optional, Sequence
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy import MetaData
+from sqlalchemy import MetaData, text
 from config.settings import settings
+from config.log_config import instrument_engine
+
+_engine: Optional[AsyncEngine] = None
+_sessionmaker: Optional[async_sessionmaker] = None
+
+def get_engine() -> AsyncEngine:
+    """Return the process-wide async engine, creating it on first call"""
+    global _engine
+    if _engine is None:
+        from sqlalchemy.ext.asyncio import create_async_engine
+
+        # Enable SSL for asyncpg if requested (e.g., when using Neon)
+        connect_args = {"ssl": True} if settings.DB_SSLMODE.lower() in ("require", "verify-full", "verify-ca") else {}
+
+        # Prepared statement caching per connection (disabled behind PgBouncer,
+        # where a pooled server connection may not hold our prepared statements)
+        if settings.DB_PGBOUNCER:
+            from uuid import uuid4
+
+            connect_args["prepared_statement_cache_size"] = 0
+            connect_args["statement_cache_size"] = 0
+            connect_args["prepared_statement_name_func"] = lambda: f"__asyncpg_{uuid4()}__"
+        else:
+            connect_args["prepared_statement_cache_size"] = settings.DB_STATEMENT_CACHE_SIZE
+
+        # Pool limits are per worker process, sized to fit DB_MAX_CONNECTIONS
+        pool_size, max_overflow = settings.db_pool_limits
+
+        _engine = create_async_engine(
+            settings.database_url,
+            future=True,
+            pool_pre_ping=True,  # Verify connections before use
+            pool_recycle=300,    # Recycle connections every 5 minutes
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            query_cache_size=settings.DB_COMPILED_CACHE_SIZE,  # SQLAlchemy compiled SQL cache
+            connect_args=connect_args,
+        )
+        # Statement timing and SQL logging through the queued logger (LOG_SQL)
+        instrument_engine(_engine.sync_engine)
+    return _engine
+
+def get_sessionmaker() -> async_sessionmaker:
+    """Return the async session factory bound to the lazy engine"""
+    global _sessionmaker
+    if _sessionmaker is None:
+        _sessionmaker = async_sessionmaker(
+            get_engine(),
+            class_=AsyncSession,
+            expire_on_commit=False
+        )
+    return _sessionmaker
 
-# Enable SSL for asyncpg if requested (e.g., when using Neon)
-connect_args = {"ssl": True} if settings.DB_SSLMODE.lower() in ("require", "verify-full", "verify-ca") else {}
-
-# Create async engine
-engine = create_async_engine(
-    settings.database_url,
-    echo=settings.is_development,  # Show SQL queries in development
-    future=True,
-    pool_pre_ping=True,  # Verify connections before use
-    pool_recycle=300,    # Recycle connections every 5 minutes
-    connect_args=connect_args,
-)
-
-# Create async session maker
-AsyncSessionLocal = async_sessionmaker(
-    engine, 
-    class_=AsyncSession, 
-    expire_on_commit=False
-)
+def __getattr__(name):
+    # Backwards compatible module attributes (`engine`, `AsyncSessionLocal`)
+    if name == "engine":
+        return get_engine()
+    if name == "AsyncSessionLocal":
+        return get_sessionmaker()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # Create base model with metadata
 metadata = MetaData()
@@ -35,7 +81,7 @@ async def get_database_session():
     Dependency to get database session
     This will be used with FastAPI's Depends()
     """
-    async with AsyncSessionLocal() as session:
+    async with get_sessionmaker()() as session:
         try:
             yield session
         except Exception as e:
@@ -45,11 +91,47 @@ async def get_database_session():
             await session.close()
 
 async def create_tables():
-    """Create all tables defined in models"""
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    """Create all tables and indexes defined in models that are missing"""
+    # Make sure every model is registered on Base.metadata
+    import models.book_model  # noqa: F401
+    import models.book_archive_model  # noqa: F401
+
+    def create_all(sync_conn):
+        Base.metadata.create_all(sync_conn)
+        # create_all skips indexes of tables that already exist
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(sync_conn, checkfirst=True)
+
+    async with get_engine().begin() as conn:
+        await conn.run_sync(create_all)
 
 async def drop_tables():
     """Drop all tables (use with caution!)"""
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.drop_all)
\ No newline at end of file
+    async with get_engine().begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+
+async def warm_pool(size: Optional[int] = None, statements: Sequence = ()):
+    """
+    Open `size` pooled connections up front so first requests skip the connect cost
+
+    Each connection also executes `statements` (pairs of statement and bind
+    parameters) once, which makes asyncpg prepare and cache them on that
+    connection.
+    """
+    if size is None:
+        size = settings.db_pool_limits[0]
+
+    async def _touch():
+        async with get_engine().connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            for statement, params in statements:
+                await conn.execute(statement, params)
+
+    # Concurrent checkouts force the pool to open distinct connections
+    await asyncio.gather(*(_touch() for _ in range(size)))
+
+async def dispose_engine():
+    """Close all pooled connections (called on shutdown)"""
+    if _engine is not None:
+        await _engine.dispose()
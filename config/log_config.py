@@ -0,0 +1,208 @@
+"""
+Structured, non-blocking logging
+
+Log calls on the event loop only copy the record into a bounded queue; a
+QueueListener thread formats it (JSON by default) and writes it to stdout.
+Every record carries the id of the request being served, so access,
+route/controller and SQL events of one request can be correlated.
+"""
+import atexit
+import copy
+import json
+import logging
+import queue
+import sys
+import time
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+from config.settings import settings
+
+access_logger = logging.getLogger("access")
+sql_logger = logging.getLogger("sql")
+
+class RequestContext:
+    """Per-request correlation id, sampling decision and SQL counters"""
+
+    __slots__ = ("request_id", "sampled", "db_queries", "db_time_ms")
+
+    def __init__(self, request_id: str, sampled: bool = True):
+        self.request_id = request_id
+        self.sampled = sampled
+        self.db_queries = 0
+        self.db_time_ms = 0.0
+
+# Set by the access log middleware for the duration of each request
+request_context: ContextVar[Optional[RequestContext]] = ContextVar("request_context", default=None)
+
+async def without_request_context(coro):
+    """
+    Await `coro` detached from the request being served
+
+    Tasks copy the context of the code that creates them, so a background
+    task started while serving a request would tag its records with that
+    request's id and add its statements to that request's DB counters.
+    """
+    request_context.set(None)
+    return await coro
+
+# Attributes every LogRecord has; anything else was passed through `extra`
+_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "request_id"}
+
+def _extra_fields(record: logging.LogRecord) -> dict:
+    return {key: value for key, value in vars(record).items() if key not in _RECORD_ATTRS}
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: ts, level, logger, message, request_id, extras"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if getattr(record, "request_id", None):
+            entry["request_id"] = record.request_id
+        entry.update(_extra_fields(record))
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+class TextFormatter(logging.Formatter):
+    """Human-readable lines for local development (LOG_FORMAT=text)"""
+
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)-7s %(name)s [%(request_id)s] %(message)s")
+
+    def format(self, record: logging.LogRecord) -> str:
+        if getattr(record, "request_id", None) is None:
+            record.request_id = "-"
+        line = super().format(record)
+        fields = _extra_fields(record)
+        if fields:
+            line += " " + " ".join(f"{key}={value}" for key, value in fields.items())
+        return line
+
+class NonBlockingQueueHandler(QueueHandler):
+    """QueueHandler that never waits: records are dropped (and counted) when full"""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+        self.addFilter(self._add_request_id)
+
+    @staticmethod
+    def _add_request_id(record: logging.LogRecord) -> bool:
+        # Runs on the caller's thread, where the request context is visible
+        context = request_context.get()
+        record.request_id = context.request_id if context else None
+        return True
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Only merge args and render tracebacks here; JSON encoding happens
+        # on the listener thread
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = record.exc_text or logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+_listener: Optional[QueueListener] = None
+_handler: Optional[NonBlockingQueueHandler] = None
+
+def setup_logging():
+    """Route all logging (app, uvicorn, SQLAlchemy) through the queue (idempotent)"""
+    global _listener, _handler
+    if _listener is not None:
+        return
+
+    stream = logging.StreamHandler(sys.stdout)
+    stream.setFormatter(JsonFormatter() if settings.LOG_FORMAT == "json" else TextFormatter())
+
+    log_queue: queue.Queue = queue.Queue(settings.LOG_QUEUE_SIZE)
+    _handler = NonBlockingQueueHandler(log_queue)
+
+    root = logging.getLogger()
+    root.handlers[:] = [_handler]
+    root.setLevel(settings.LOG_LEVEL)
+
+    # Uvicorn's handlers write synchronously; send its records to the queue too
+    for name in ("uvicorn", "uvicorn.error", "uvicorn.access"):
+        logger = logging.getLogger(name)
+        logger.handlers.clear()
+        logger.propagate = True
+    # Statements are logged by instrument_engine, not by SQLAlchemy's echo
+    logging.getLogger("sqlalchemy.engine").setLevel(logging.WARNING)
+
+    _listener = QueueListener(log_queue, stream)
+    _listener.start()
+    # Flush what is still queued when the process exits
+    atexit.register(stop_logging)
+
+def stop_logging():
+    """Drain the queue and stop the writer thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+def dropped_records() -> int:
+    """Records discarded because the queue was full"""
+    return _handler.dropped if _handler else 0
+
+def instrument_engine(engine):
+    """
+    Time every statement of a (sync) engine
+
+    Statements count towards the current request's db_queries/db_time_ms.
+    They are logged when LOG_SQL is on and the request is sampled, always
+    when slower than LOG_SLOW_QUERY_MS, and always on errors.
+    """
+    from sqlalchemy import event
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        duration_ms = (time.perf_counter() - conn.info["query_start"].pop()) * 1000
+        request = request_context.get()
+        if request is not None:
+            request.db_queries += 1
+            request.db_time_ms += duration_ms
+
+        slow = duration_ms >= settings.LOG_SLOW_QUERY_MS
+        if slow or (settings.log_sql and (request is None or request.sampled)):
+            sql_logger.log(
+                logging.WARNING if slow else logging.INFO,
+                "slow query" if slow else "query",
+                extra={
+                    "statement": statement,
+                    "duration_ms": round(duration_ms, 2),
+                    "rows": cursor.rowcount,
+                    "executemany": executemany,
+                }
+            )
+
+    @event.listens_for(engine, "handle_error")
+    def handle_error(exception_context):
+        starts = exception_context.connection.info.get("query_start") if exception_context.connection else None
+        extra = {
+            "statement": exception_context.statement,
+            "error": str(exception_context.original_exception),
+        }
+        if starts:
+            extra["duration_ms"] = round((time.perf_counter() - starts.pop()) * 1000, 2)
+        sql_logger.error("query failed", extra=extra)
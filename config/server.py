@@ -0,0 +1,82 @@
+"""
+Uvicorn launcher for development and production modes
+"""
+import importlib.util
+import logging
+import os
+from typing import Dict, Any
+
+from config.settings import settings
+from config.log_config import setup_logging
+
+logger = logging.getLogger(__name__)
+
+
+def _has_module(name: str) -> bool:
+    """Check whether an optional module is installed"""
+    return importlib.util.find_spec(name) is not None
+
+
+def production_options() -> Dict[str, Any]:
+    """
+    Build uvicorn options for a multi-process production server
+
+    Workers are auto-sized to CPU cores (WEB_CONCURRENCY overrides), uvloop and
+    httptools are used when available, and on shutdown each worker stops
+    accepting connections and drains in-flight requests for up to
+    SERVER_GRACEFUL_TIMEOUT seconds.
+    """
+    return {
+        "host": "0.0.0.0",
+        "port": settings.APP_PORT,
+        "workers": settings.workers,
+        "loop": "uvloop" if _has_module("uvloop") else "asyncio",
+        "http": "httptools" if _has_module("httptools") else "h11",
+        "backlog": settings.SERVER_BACKLOG,
+        "timeout_keep_alive": settings.SERVER_KEEPALIVE,
+        "timeout_graceful_shutdown": settings.SERVER_GRACEFUL_TIMEOUT,
+        "proxy_headers": True,
+        "forwarded_allow_ips": settings.FORWARDED_ALLOW_IPS,
+        # Access and error logs go through the app's queued JSON logging
+        "access_log": False,
+        "log_config": None,
+        "log_level": "warning",
+    }
+
+
+def development_options() -> Dict[str, Any]:
+    """Build uvicorn options for a single auto-reloading development server"""
+    return {
+        "host": "0.0.0.0",
+        "port": settings.APP_PORT,
+        "reload": settings.is_development,
+        "access_log": False,
+        "log_config": None,
+        "log_level": "info" if settings.is_development else "warning",
+    }
+
+
+def run(production: bool = False):
+    """Start uvicorn serving main:app"""
+    import uvicorn
+
+    setup_logging()
+    if production or settings.is_production:
+        options = production_options()
+        # Workers re-read settings on import; pin the resolved count so each
+        # one sizes its connection pool against the same total
+        os.environ["WEB_CONCURRENCY"] = str(options["workers"])
+        pool_size, max_overflow = settings.db_pool_limits
+        logger.info(
+            "Starting %d workers", options["workers"],
+            extra={
+                "loop": options["loop"],
+                "http": options["http"],
+                "pool_size": pool_size,
+                "max_overflow": max_overflow,
+            }
+        )
+    else:
+        options = development_options()
+
+    uvicorn.run("main:app", **options)
@@ -2,13 +2,48 @@
 Configuration settings for the Books API
 """
 import os
-from typing import Optional
+from typing import Optional, Tuple
 from dotenv import load_dotenv
 
 # Load environment variables from .env file (only in development)
 if os.getenv("APP_ENV") != "production":
     load_dotenv()
 
+def available_cpus() -> int:
+    """
+    CPUs this process may actually use
+
+    os.cpu_count() reports the host's cores inside containers; the affinity
+    mask and the cgroup CPU quota (v2 cpu.max or v1 cfs_quota/cfs_period)
+    reflect the container's limit.
+    """
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:  # not available on macOS/Windows
+        cpus = os.cpu_count() or 1
+
+    quota = None
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            limit, period = f.read().split()[:2]
+            if limit != "max":
+                quota = int(limit) / int(period)
+    except (OSError, ValueError):
+        try:
+            with open("/sys/fs/cgroup/cpu/cpu.cfs_quota_us") as f:
+                limit = int(f.read())
+            with open("/sys/fs/cgroup/cpu/cpu.cfs_period_us") as f:
+                period = int(f.read())
+            if limit > 0 and period > 0:
+                quota = limit / period
+        except (OSError, ValueError):
+            pass
+
+    if quota is not None:
+        # A fractional quota (e.g. 0.5 CPU) still gets one worker
+        cpus = min(cpus, max(int(quota), 1))
+    return max(cpus, 1)
+
 class Settings:
     """Application settings loaded from environment variables"""
     
@@ -24,7 +59,87 @@ class Settings:
     APP_ENV: str = os.getenv("APP_ENV", "development")
     APP_DEBUG: bool = os.getenv("APP_DEBUG", "true").lower() == "true"
     APP_PORT: int = int(os.getenv("PORT", os.getenv("APP_PORT", "8000")))
-    
+
+    # Response compression (brotli/zstd are used only when installed)
+    COMPRESSION_ENABLED: bool = os.getenv("COMPRESSION_ENABLED", "true").lower() == "true"
+    COMPRESSION_MINIMUM_SIZE: int = int(os.getenv("COMPRESSION_MINIMUM_SIZE", "1024"))
+    COMPRESSION_GZIP_LEVEL: int = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+    COMPRESSION_BROTLI_QUALITY: int = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4"))
+    COMPRESSION_ZSTD_LEVEL: int = int(os.getenv("COMPRESSION_ZSTD_LEVEL", "3"))
+
+    # Production server (0 workers = one per available CPU, at most WEB_MAX_WORKERS)
+    WEB_CONCURRENCY: int = int(os.getenv("WEB_CONCURRENCY", "0"))
+    WEB_MAX_WORKERS: int = int(os.getenv("WEB_MAX_WORKERS", "8"))
+    SERVER_BACKLOG: int = int(os.getenv("SERVER_BACKLOG", "2048"))
+    SERVER_KEEPALIVE: int = int(os.getenv("SERVER_KEEPALIVE", "5"))
+    # Peers whose X-Forwarded-* headers are trusted (uvicorn's default; "*"
+    # only when nothing but the load balancer can reach the server)
+    FORWARDED_ALLOW_IPS: str = os.getenv("FORWARDED_ALLOW_IPS", "127.0.0.1")
+    SERVER_GRACEFUL_TIMEOUT: int = int(os.getenv("SERVER_GRACEFUL_TIMEOUT", "30"))
+
+    # Connection pool sizing (per worker process)
+    DB_MAX_CONNECTIONS: int = int(os.getenv("DB_MAX_CONNECTIONS", "100"))
+    DB_RESERVED_CONNECTIONS: int = int(os.getenv("DB_RESERVED_CONNECTIONS", "10"))
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT: int = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_PREWARM: bool = os.getenv("DB_POOL_PREWARM", "true").lower() == "true"
+
+    # Statement caching (DB_PGBOUNCER disables asyncpg prepared statement caches)
+    DB_COMPILED_CACHE_SIZE: int = int(os.getenv("DB_COMPILED_CACHE_SIZE", "500"))
+    DB_STATEMENT_CACHE_SIZE: int = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "100"))
+    DB_PGBOUNCER: bool = os.getenv("DB_PGBOUNCER", "false").lower() == "true"
+
+    # Group commit for single-book creates (opt-in)
+    BOOK_CREATE_BATCHING: bool = os.getenv("BOOK_CREATE_BATCHING", "false").lower() == "true"
+    BOOK_CREATE_BATCH_WINDOW_MS: float = float(os.getenv("BOOK_CREATE_BATCH_WINDOW_MS", "5"))
+    BOOK_CREATE_BATCH_MAX_SIZE: int = int(os.getenv("BOOK_CREATE_BATCH_MAX_SIZE", "500"))
+
+    # Archival of soft-deleted books into libros_archive
+    ARCHIVE_ENABLED: bool = os.getenv("ARCHIVE_ENABLED", "false").lower() == "true"
+    ARCHIVE_RETENTION_DAYS: int = int(os.getenv("ARCHIVE_RETENTION_DAYS", "30"))
+    ARCHIVE_BATCH_SIZE: int = int(os.getenv("ARCHIVE_BATCH_SIZE", "1000"))
+    ARCHIVE_INTERVAL_SECONDS: int = int(os.getenv("ARCHIVE_INTERVAL_SECONDS", "3600"))
+
+    # In-memory catalog snapshot for list/filter reads
+    CATALOG_SNAPSHOT_ENABLED: bool = os.getenv("CATALOG_SNAPSHOT_ENABLED", "false").lower() == "true"
+    CATALOG_NOTIFY_CHANNEL: str = os.getenv("CATALOG_NOTIFY_CHANNEL", "libros_changes")
+    CATALOG_RELOAD_SECONDS: int = int(os.getenv("CATALOG_RELOAD_SECONDS", "600"))
+    # Author + price filters scanning more candidate rows than this use SQL
+    CATALOG_SNAPSHOT_MAX_SCAN: int = int(os.getenv("CATALOG_SNAPSHOT_MAX_SCAN", "200000"))
+
+    # Typeahead prefix index for /books/suggest (every worker loads all live
+    # titles and authors in a background thread; until it is ready, and when
+    # disabled, the endpoint uses the idx_libros_*_prefix indexes)
+    SUGGEST_INDEX_ENABLED: bool = os.getenv("SUGGEST_INDEX_ENABLED", "true").lower() == "true"
+    SUGGEST_RELOAD_SECONDS: int = int(os.getenv("SUGGEST_RELOAD_SECONDS", "300"))
+
+    # Result cache for list/search responses
+    LIST_CACHE_ENABLED: bool = os.getenv("LIST_CACHE_ENABLED", "false").lower() == "true"
+    LIST_CACHE_TTL_SECONDS: float = float(os.getenv("LIST_CACHE_TTL_SECONDS", "30"))
+    LIST_CACHE_MAX_ENTRIES: int = int(os.getenv("LIST_CACHE_MAX_ENTRIES", "1000"))
+    LIST_CACHE_MAX_BYTES: int = int(os.getenv("LIST_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+    # Rows per UPDATE statement in bulk operations
+    BULK_CHUNK_SIZE: int = int(os.getenv("BULK_CHUNK_SIZE", "1000"))
+
+    # Storage backend for the book routes: "postgres" or "memory" (no database)
+    BOOK_REPOSITORY: str = os.getenv("BOOK_REPOSITORY", "postgres").lower()
+
+    # Structured logging (records are queued; a background thread formats and writes them)
+    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO").upper()
+    LOG_FORMAT: str = os.getenv("LOG_FORMAT", "json").lower()
+    LOG_QUEUE_SIZE: int = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+    LOG_ACCESS_SAMPLE_RATE: float = float(os.getenv("LOG_ACCESS_SAMPLE_RATE", "1.0"))
+    LOG_SLOW_REQUEST_MS: float = float(os.getenv("LOG_SLOW_REQUEST_MS", "500"))
+    LOG_SLOW_QUERY_MS: float = float(os.getenv("LOG_SLOW_QUERY_MS", "200"))
+
+    # Log every SQL statement (defaults to development only; replaces engine echo)
+    LOG_SQL: Optional[str] = os.getenv("LOG_SQL")
+
+    # Run schema DDL on startup (defaults to development only; use scripts/migrate.py otherwise)
+    DB_AUTO_MIGRATE: Optional[str] = os.getenv("DB_AUTO_MIGRATE")
+
     @property
     def database_url(self) -> str:
         """Construct database URL for SQLAlchemy"""
@@ -41,6 +156,44 @@ class Settings:
             f"{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
         )
     
+    @property
+    def workers(self) -> int:
+        """Number of server worker processes (auto-sized to the CPU limit when 0)"""
+        if self.WEB_CONCURRENCY > 0:
+            return self.WEB_CONCURRENCY
+        return max(min(available_cpus(), self.WEB_MAX_WORKERS), 1)
+
+    @property
+    def db_pool_limits(self) -> Tuple[int, int]:
+        """
+        Per-worker (pool_size, max_overflow) so that all workers together stay
+        within DB_MAX_CONNECTIONS minus the connections reserved for admin tools
+        """
+        budget = max(self.DB_MAX_CONNECTIONS - self.DB_RESERVED_CONNECTIONS, 1)
+        per_worker = max(budget // self.workers, 1)
+        pool_size = min(self.DB_POOL_SIZE, per_worker)
+        max_overflow = min(self.DB_MAX_OVERFLOW, per_worker - pool_size)
+        return pool_size, max_overflow
+
+    @property
+    def auto_migrate(self) -> bool:
+        """Whether startup should create missing tables"""
+        if self.DB_AUTO_MIGRATE is not None:
+            return self.DB_AUTO_MIGRATE.lower() == "true"
+        return self.is_development
+
+    @property
+    def uses_database(self) -> bool:
+        """Whether the API is backed by PostgreSQL (false with the in-memory repository)"""
+        return self.BOOK_REPOSITORY != "memory"
+
+    @property
+    def log_sql(self) -> bool:
+        """Whether sampled requests log each SQL statement"""
+        if self.LOG_SQL is not None:
+            return self.LOG_SQL.lower() == "true"
+        return self.is_development
+
     @property
     def is_production(self) -> bool:
         """Check if running in production environment"""
@@ -0,0 +1,145 @@
+"""
+Archival of soft-deleted books
+"""
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Dict, Any
+from sqlalchemy import DateTime, bindparam, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import SQLAlchemyError
+from config.database import get_sessionmaker
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Advisory lock key so only one worker process archives at a time
+ARCHIVE_LOCK_KEY = 7_311_024
+
+# Move one batch in a single statement. SKIP LOCKED avoids waiting on rows
+# that requests are touching, and the small LIMIT keeps each transaction short.
+ARCHIVE_BATCH_SQL = text("""
+    WITH candidates AS (
+        SELECT id_libro FROM libros
+        WHERE is_deleted = true AND updated_at < :cutoff
+        ORDER BY updated_at
+        LIMIT :batch_size
+        FOR UPDATE SKIP LOCKED
+    ),
+    moved AS (
+        DELETE FROM libros
+        USING candidates
+        WHERE libros.id_libro = candidates.id_libro
+        RETURNING libros.*
+    ),
+    archived AS (
+        INSERT INTO libros_archive
+            (id_libro, name, author, price, description, id_user, created_at, updated_at)
+        SELECT id_libro, name, author, price, description, id_user, created_at, updated_at
+        FROM moved
+        ON CONFLICT (id_libro) DO NOTHING
+    )
+    SELECT count(*) AS moved_rows, coalesce(sum(pg_column_size(moved.*)), 0) AS moved_bytes
+    FROM moved
+""").bindparams(
+    # Typed as timestamptz: the aware cutoff compares correctly whether
+    # libros.updated_at is TIMESTAMP (create_tables.sql) or TIMESTAMPTZ
+    # (model DDL); asyncpg rejects aware datetimes bound as plain TIMESTAMP
+    bindparam("cutoff", type_=DateTime(timezone=True))
+)
+
+TABLE_SIZE_SQL = text("SELECT pg_total_relation_size('libros')")
+
+class ArchiveController:
+    """Controller class for archiving soft-deleted books"""
+
+    @staticmethod
+    async def archive_batch(db: AsyncSession, cutoff: datetime, batch_size: int) -> Optional[Dict[str, int]]:
+        """
+        Move one batch of soft-deleted books into libros_archive
+
+        Args:
+            db: Database session
+            cutoff: Only books soft-deleted before this moment are moved
+            batch_size: Maximum rows moved in this transaction
+
+        Returns:
+            Dictionary with rows and bytes moved (None if another worker holds the lock)
+        """
+        try:
+            locked = await db.scalar(
+                text("SELECT pg_try_advisory_xact_lock(:key)"),
+                {"key": ARCHIVE_LOCK_KEY}
+            )
+            if not locked:
+                await db.rollback()
+                return None
+
+            result = await db.execute(
+                ARCHIVE_BATCH_SQL,
+                {"cutoff": cutoff, "batch_size": batch_size}
+            )
+            row = result.one()
+            await db.commit()
+            return {"rows": row.moved_rows, "bytes": int(row.moved_bytes)}
+
+        except SQLAlchemyError as e:
+            await db.rollback()
+            raise Exception(f"Database error: {str(e)}")
+
+    @staticmethod
+    async def archive_deleted_books(
+        retention_days: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        max_batches: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Archive soft-deleted books older than the retention window in batches
+
+        Args:
+            retention_days: Days a soft-deleted book stays in libros
+            batch_size: Rows moved per transaction
+            max_batches: Optional cap on batches for this run
+
+        Returns:
+            Report with rows and row bytes reclaimed, and libros size before/after
+            (table files shrink only after VACUUM; freed space is reused before that)
+        """
+        retention_days = settings.ARCHIVE_RETENTION_DAYS if retention_days is None else retention_days
+        batch_size = batch_size or settings.ARCHIVE_BATCH_SIZE
+        cutoff = datetime.now(timezone.utc) - timedelta(days=retention_days)
+
+        report = {"rows": 0, "bytes": 0, "batches": 0, "cutoff": cutoff.isoformat()}
+        async with get_sessionmaker()() as db:
+            report["table_bytes_before"] = await db.scalar(TABLE_SIZE_SQL)
+            await db.commit()
+
+            while max_batches is None or report["batches"] < max_batches:
+                moved = await ArchiveController.archive_batch(db, cutoff, batch_size)
+                if not moved or moved["rows"] == 0:
+                    break
+                report["rows"] += moved["rows"]
+                report["bytes"] += moved["bytes"]
+                report["batches"] += 1
+                # Yield between batches so the job never monopolises the loop
+                await asyncio.sleep(0)
+
+            report["table_bytes_after"] = await db.scalar(TABLE_SIZE_SQL)
+            await db.commit()
+
+        return report
+
+    @staticmethod
+    async def run_archival_loop():
+        """Background task: archive periodically every ARCHIVE_INTERVAL_SECONDS"""
+        while True:
+            try:
+                report = await ArchiveController.archive_deleted_books()
+                if report["rows"]:
+                    logger.info(
+                        "Archived %d deleted books", report["rows"],
+                        extra={"rows": report["rows"], "bytes": report["bytes"]}
+                    )
+            except Exception:
+                logger.exception("Archival run failed")
+            await asyncio.sleep(settings.ARCHIVE_INTERVAL_SECONDS)
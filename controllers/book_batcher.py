@@ -0,0 +1,147 @@
+"""
+Write-behind batching (group commit) for single-book creates
+
+Concurrent `create_book` calls that arrive within a short window are
+collected by a background task and inserted with one multi-row INSERT in a
+single transaction, so bursts of individual POSTs pay one commit (and one
+WAL flush) per batch instead of one per book.
+"""
+import asyncio
+import logging
+from typing import List, Optional, Tuple
+from sqlalchemy import insert
+from config.database import get_sessionmaker
+from config.log_config import without_request_context
+from config.settings import settings
+from controllers import book_events
+from models.book_model import Book
+from schemas.book_schema import BookCreate
+
+logger = logging.getLogger(__name__)
+
+_Pending = Tuple[BookCreate, asyncio.Future]
+
+class BookCreateBatcher:
+    """Collects pending creates and flushes them as one transaction"""
+
+    def __init__(self, window_ms: float, max_batch_size: int):
+        self.window = window_ms / 1000
+        self.max_batch_size = max_batch_size
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def _ensure_started(self):
+        """Start the background flusher on the running event loop"""
+        if self._task is None or self._task.done():
+            # A restarted flusher keeps draining creates already queued
+            if self._queue is None:
+                self._queue = asyncio.Queue()
+            # Started by whichever request submits first; serves them all
+            self._task = asyncio.create_task(without_request_context(self._run()))
+
+    async def submit(self, book_data: BookCreate) -> Book:
+        """
+        Queue a book for creation and wait for its batch to commit
+
+        Args:
+            book_data: Book creation data
+
+        Returns:
+            Created book instance (or raises this book's own error)
+        """
+        self._ensure_started()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((book_data, future))
+        return await future
+
+    async def stop(self):
+        """Flush anything still queued and stop the background task"""
+        if self._task is None or self._task.done():
+            return
+        # The sentinel is queued behind pending creates, so they flush first
+        await self._queue.put(None)
+        await self._task
+        self._task = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            item = await self._queue.get()
+            if item is None:
+                return
+            batch = [item]
+            deadline = loop.time() + self.window
+
+            # Keep collecting until the window closes or the batch is full
+            stopping = False
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            try:
+                await self._flush(batch)
+            except Exception as e:
+                # Session close or connection loss outside the per-book
+                # handling: fail this batch, keep serving the queue
+                logger.exception("Book create batch of %d failed", len(batch))
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+            if stopping:
+                return
+
+    async def _flush(self, batch: List[_Pending]):
+        """Insert a batch in one statement; isolate failures per book"""
+        # Callers that gave up (e.g. client disconnected) are dropped
+        batch = [(data, future) for data, future in batch if not future.done()]
+        if not batch:
+            return
+
+        rows = [data.model_dump() for data, _ in batch]
+        try:
+            async with get_sessionmaker()() as db:
+                result = await db.scalars(
+                    insert(Book).returning(Book, sort_by_parameter_order=True),
+                    rows
+                )
+                books = result.all()
+                await db.commit()
+        except Exception:
+            # One bad row (or a lost connection) fails the whole statement:
+            # retry individually so each caller gets its own result or error
+            await self._flush_individually(batch)
+            return
+
+        for (_, future), book in zip(batch, books):
+            book_events.notify("created", book)
+            if not future.done():
+                future.set_result(book)
+
+    async def _flush_individually(self, batch: List[_Pending]):
+        from controllers.book_controller import BookController
+
+        for data, future in batch:
+            async with get_sessionmaker()() as db:
+                try:
+                    book = await BookController.create_book(db, data)
+                except Exception as e:
+                    if not future.done():
+                        future.set_exception(e)
+                    continue
+            if not future.done():
+                future.set_result(book)
+
+# Global batcher instance (used when BOOK_CREATE_BATCHING is enabled)
+book_create_batcher = BookCreateBatcher(
+    window_ms=settings.BOOK_CREATE_BATCH_WINDOW_MS,
+    max_batch_size=settings.BOOK_CREATE_BATCH_MAX_SIZE
+)
@@ -1,15 +1,25 @@
 """
 Book controller with business logic
 """
+import logging
 import uuid
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_, or_
+from sqlalchemy import select, update, and_, func
 from sqlalchemy.exc import SQLAlchemyError
 from models.book_model import Book
-from schemas.book_schema import BookCreate, BookUpdate
+from controllers.book_queries import (
+    list_query_params, value_filter_conditions, has_value_filters, encode_cursor, DEFAULT_SORT
+)
+from controllers import book_events
+from controllers.catalog_snapshot import catalog_snapshot
+from controllers.suggest_index import suggest_index
+from config.settings import settings
+from schemas.book_schema import BookCreate, BookUpdate, BookBulkUpdate, BookBulkDelete
 import math
 
+logger = logging.getLogger(__name__)
+
 class BookController:
     """Controller class for Book operations"""
     
@@ -21,75 +31,197 @@ class BookController:
         q: Optional[str] = None,
         author: Optional[str] = None,
         min_price: Optional[float] = None,
-        max_price: Optional[float] = None
+        max_price: Optional[float] = None,
+        id_user: Optional[str] = None,
+        cursor: Optional[str] = None,
+        sort: str = DEFAULT_SORT,
+        with_total: bool = True
     ) -> Dict[str, Any]:
         """
         Get books with pagination, search and filters
         
         Args:
             db: Database session
-            page: Page number (starts at 1)
+            page: Page number (starts at 1, ignored when `cursor` is given)
             limit: Items per page
             q: Search query (searches in name and description)
             author: Filter by author
             min_price: Minimum price filter
             max_price: Maximum price filter
+            id_user: Filter by owner
+            cursor: Keyset cursor from a previous page's `next_cursor`
+            sort: Whitelisted order (see book_queries.SORTS)
+            with_total: Run the COUNT for offset pages (keyset pages never do)
             
         Returns:
-            Dictionary with books data and pagination info
+            Dictionary with books data and pagination info (pages without
+            the COUNT have `total` and `total_pages` None; keyset pages also
+            have `page` None)
+            
+        Raises:
+            InvalidCursorError: If `cursor` cannot be decoded for `sort`
+            ValueError: If `sort` is unknown or needs `q`
         """
+        def next_cursor(row) -> str:
+            return encode_cursor(sort, row[0], row[1] if len(row) > 1 else None)
+        
         try:
-            # Base query - only non-deleted books
-            query = select(Book).where(Book.is_deleted == False)
-            
-            # Apply search filter
-            if q:
-                search_filter = or_(
-                    Book.name.ilike(f"%{q}%"),
-                    Book.description.ilike(f"%{q}%"),
-                    Book.author.ilike(f"%{q}%")
+            if cursor or not with_total:
+                # Keyset page (index range scan from the cursor) or offset page
+                # without COUNT: one extra row tells whether another page follows
+                (_, query), _, page_params = list_query_params(
+                    page=page,
+                    limit=limit,
+                    q=q,
+                    author=author,
+                    min_price=min_price,
+                    max_price=max_price,
+                    id_user=id_user,
+                    cursor=cursor,
+                    sort=sort
                 )
-                query = query.where(search_filter)
-            
-            # Apply author filter
-            if author:
-                query = query.where(Book.author.ilike(f"%{author}%"))
+                if not cursor:
+                    page_params["limit"] = limit + 1
+                result = await db.execute(query, page_params)
+                rows = result.all()
+                has_more = len(rows) > limit
+                rows = rows[:limit]
+                
+                return {
+                    "books": [row[0] for row in rows],
+                    "pagination": {
+                        "page": None if cursor else page,
+                        "limit": limit,
+                        "total": None,
+                        "total_pages": None,
+                        "next_cursor": next_cursor(rows[-1]) if has_more else None
+                    }
+                }
             
-            # Apply price filters
-            if min_price is not None:
-                query = query.where(Book.price >= min_price)
-            if max_price is not None:
-                query = query.where(Book.price <= max_price)
+            snapshot_page = None
+            if settings.CATALOG_SNAPSHOT_ENABLED and catalog_snapshot.can_answer(q, id_user, sort):
+                # Filter, count and paginate in memory (None: too wide a scan)
+                snapshot_page = catalog_snapshot.query(
+                    page, limit, author=author, min_price=min_price, max_price=max_price
+                )
             
-            # Count total records for pagination
-            count_query = select(func.count()).select_from(query.subquery())
-            total_result = await db.execute(count_query)
-            total = total_result.scalar()
+            if snapshot_page is not None:
+                # Fetch only the page by PK
+                page_ids, total = snapshot_page
+                rows = [(book,) for book in await BookController.get_books_by_ids(db, page_ids)]
+            else:
+                # Reuse the precompiled statement for this filter combination
+                (count_query, query), count_params, page_params = list_query_params(
+                    page=page,
+                    limit=limit,
+                    q=q,
+                    author=author,
+                    min_price=min_price,
+                    max_price=max_price,
+                    id_user=id_user,
+                    sort=sort
+                )
+                
+                # Count total records for pagination
+                total_result = await db.execute(count_query, count_params)
+                total = total_result.scalar()
+                
+                # Execute query
+                result = await db.execute(query, page_params)
+                rows = result.all()
             
             # Calculate pagination
             total_pages = math.ceil(total / limit) if total > 0 else 0
-            offset = (page - 1) * limit
-            
-            # Apply pagination and ordering
-            query = query.order_by(Book.created_at.desc()).offset(offset).limit(limit)
-            
-            # Execute query
-            result = await db.execute(query)
-            books = result.scalars().all()
             
             return {
-                "books": books,
+                "books": [row[0] for row in rows],
                 "pagination": {
                     "page": page,
                     "limit": limit,
                     "total": total,
-                    "total_pages": total_pages
+                    "total_pages": total_pages,
+                    # Switch to keyset pagination from here on
+                    "next_cursor": next_cursor(rows[-1]) if rows and page * limit < total else None
                 }
             }
             
         except SQLAlchemyError as e:
             raise Exception(f"Database error: {str(e)}")
     
+    @staticmethod
+    async def suggest(db: AsyncSession, prefix: str, limit: int = 5) -> List[Dict[str, Any]]:
+        """
+        Title and author completions for a typed prefix
+        
+        Args:
+            db: Database session
+            prefix: Text typed so far
+            limit: Maximum suggestions
+            
+        Returns:
+            List of suggestions ({"text", "type", "count"})
+        """
+        if settings.SUGGEST_INDEX_ENABLED and suggest_index.ready:
+            return suggest_index.suggest(prefix, limit)
+        
+        # Fallback while the index loads (or with it disabled): prefix LIKE on
+        # the whole title/author, served by the text_pattern_ops indexes. It is
+        # case-insensitive but not accent-insensitive and does not match later
+        # words; counts cover at most `scan_rows` matching books per column.
+        escaped = prefix.lower().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        pattern = f"{escaped}%"
+        scan_rows = max(limit * 200, 1000)
+        try:
+            suggestions = []
+            for kind, column in (("author", Book.author), ("title", Book.name)):
+                matched = (
+                    select(column.label("text"))
+                    .where(and_(Book.is_deleted == False, func.lower(column).like(pattern, escape="\\")))
+                    .limit(scan_rows)
+                    .subquery()
+                )
+                query = (
+                    select(matched.c.text, func.count())
+                    .group_by(matched.c.text)
+                    .order_by(func.count().desc(), matched.c.text)
+                    .limit(limit)
+                )
+                result = await db.execute(query)
+                suggestions.extend(
+                    {"text": text, "type": kind, "count": count} for text, count in result.all()
+                )
+            suggestions.sort(key=lambda item: (-item["count"], item["text"].lower()))
+            return suggestions[:limit]
+            
+        except SQLAlchemyError as e:
+            raise Exception(f"Database error: {str(e)}")
+    
+    @staticmethod
+    async def get_books_by_ids(db: AsyncSession, book_ids: List[str]) -> List[Book]:
+        """
+        Get live books by UUID, preserving the order of `book_ids`
+        
+        Args:
+            db: Database session
+            book_ids: Book UUIDs
+            
+        Returns:
+            List of Book instances (books deleted meanwhile are skipped)
+        """
+        if not book_ids:
+            return []
+        
+        try:
+            query = select(Book).where(
+                and_(Book.id_libro.in_(book_ids), Book.is_deleted == False)
+            )
+            result = await db.execute(query)
+            by_id = {book.id_libro: book for book in result.scalars()}
+            return [by_id[book_id] for book_id in book_ids if book_id in by_id]
+            
+        except SQLAlchemyError as e:
+            raise Exception(f"Database error: {str(e)}")
+    
     @staticmethod
     async def get_book_by_id(db: AsyncSession, book_id: str) -> Optional[Book]:
         """
@@ -143,6 +275,7 @@ class BookController:
             db.add(new_book)
             await db.commit()
             await db.refresh(new_book)
+            book_events.notify("created", new_book)
             
             return new_book
             
@@ -181,6 +314,7 @@ class BookController:
             
             await db.commit()
             await db.refresh(book)
+            book_events.notify("updated", book)
             
             return book
             
@@ -209,9 +343,135 @@ class BookController:
             # Soft delete
             book.is_deleted = True
             await db.commit()
+            book_events.notify("deleted", book)
             
             return True
             
         except SQLAlchemyError as e:
             await db.rollback()
-            raise Exception(f"Database error: {str(e)}")
\ No newline at end of file
+            raise Exception(f"Database error: {str(e)}")
+    
+    @staticmethod
+    async def _bulk_apply(
+        db: AsyncSession,
+        values: Dict[str, Any],
+        ids: Optional[List[str]] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        dry_run: bool = False,
+        action: str = "update"
+    ) -> int:
+        """
+        Apply `values` to live books selected by ID list or filters
+        
+        `action` ("update" or "delete") only labels the audit log line.
+        
+        Runs as set-based UPDATE statements of at most BULK_CHUNK_SIZE rows,
+        each in its own short transaction.
+        
+        Returns:
+            Number of books updated (or matching, on dry run)
+        """
+        chunk_size = settings.BULK_CHUNK_SIZE
+        affected = 0
+        try:
+            if ids is not None:
+                # Validate UUID format
+                for book_id in ids:
+                    uuid.UUID(book_id)
+                ids = list(dict.fromkeys(ids))
+                
+                for start in range(0, len(ids), chunk_size):
+                    conditions = [Book.id_libro.in_(ids[start:start + chunk_size]), Book.is_deleted == False]
+                    if dry_run:
+                        affected += await db.scalar(select(func.count()).select_from(Book).where(*conditions))
+                        continue
+                    result = await db.execute(
+                        update(Book).where(*conditions).values(**values)
+                        .execution_options(synchronize_session=False)
+                    )
+                    await db.commit()
+                    affected += result.rowcount
+            else:
+                # Never let an empty filter turn into "every book"
+                if not has_value_filters(**filters):
+                    raise Exception("Bulk filter must set at least one criterion")
+                conditions = value_filter_conditions(**filters)
+                if dry_run:
+                    affected = await db.scalar(select(func.count()).select_from(Book).where(*conditions))
+                    return affected
+                
+                # Walk matching rows in id order; updated rows may still match
+                # the filter (e.g. repricing), so progress is tracked by id
+                last_id = None
+                while True:
+                    chunk = select(Book.id_libro).where(*conditions)
+                    if last_id is not None:
+                        chunk = chunk.where(Book.id_libro > last_id)
+                    chunk = chunk.order_by(Book.id_libro).limit(chunk_size)
+                    
+                    result = await db.execute(
+                        update(Book).where(Book.id_libro.in_(chunk.scalar_subquery()))
+                        .values(**values)
+                        .returning(Book.id_libro)
+                        .execution_options(synchronize_session=False)
+                    )
+                    changed = result.scalars().all()
+                    await db.commit()
+                    if not changed:
+                        break
+                    affected += len(changed)
+                    last_id = max(changed)
+            
+            return affected
+            
+        except ValueError:
+            raise Exception("Invalid UUID format")
+        except SQLAlchemyError as e:
+            await db.rollback()
+            raise Exception(f"Database error: {str(e)}")
+        finally:
+            logger.info(
+                "Bulk %s of %d books", f"{action} count" if dry_run else action, affected,
+                extra={"action": action, "fields": sorted(values), "by_ids": ids is not None, "dry_run": dry_run}
+            )
+            if affected and not dry_run:
+                # Any number of rows changed: in-memory caches rebuild
+                book_events.notify("invalidate")
+    
+    @staticmethod
+    async def bulk_update(db: AsyncSession, bulk_data: BookBulkUpdate) -> Dict[str, Any]:
+        """
+        Apply one BookUpdate patch to books selected by ID list or filters
+        
+        Args:
+            db: Database session
+            bulk_data: Target (ids or filter), patch and dry_run flag
+            
+        Returns:
+            Dictionary with affected count and dry_run flag
+        """
+        values = bulk_data.patch.model_dump(exclude_unset=True)
+        filters = bulk_data.filter.model_dump() if bulk_data.filter else None
+        affected = await BookController._bulk_apply(
+            db, values, ids=bulk_data.ids, filters=filters, dry_run=bulk_data.dry_run
+        )
+        return {"affected": affected, "dry_run": bulk_data.dry_run}
+    
+    @staticmethod
+    async def bulk_delete(db: AsyncSession, bulk_data: BookBulkDelete) -> Dict[str, Any]:
+        """
+        Soft delete books selected by ID list or filters
+        
+        Args:
+            db: Database session
+            bulk_data: Target (ids or filter) and dry_run flag
+            
+        Returns:
+            Dictionary with affected count and dry_run flag
+        """
+        filters = bulk_data.filter.model_dump() if bulk_data.filter else None
+        affected = await BookController._bulk_apply(
+            db, {"is_deleted": True}, ids=bulk_data.ids, filters=filters, dry_run=bulk_data.dry_run,
+            action="delete"
+        )
+        return {"affected": affected, "dry_run": bulk_data.dry_run}
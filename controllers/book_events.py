@@ -0,0 +1,35 @@
+"""
+In-process change notifications for the libros table
+
+Controllers call `notify()` after a write commits; in-memory read
+structures (catalog snapshot, caches, indexes) subscribe to stay current.
+"""
+import logging
+from typing import Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Actions: "created", "updated", "deleted", or "invalidate" for writes that
+# affect an unknown set of rows (listeners should rebuild or drop state)
+BookListener = Callable[[str, Optional[object]], None]
+
+_listeners: List[BookListener] = []
+
+def subscribe(listener: BookListener):
+    """Register a listener called as listener(action, book)"""
+    if listener not in _listeners:
+        _listeners.append(listener)
+
+def unsubscribe(listener: BookListener):
+    """Remove a previously registered listener"""
+    if listener in _listeners:
+        _listeners.remove(listener)
+
+def notify(action: str, book: Optional[object] = None):
+    """Deliver a committed change to every listener"""
+    for listener in list(_listeners):
+        try:
+            listener(action, book)
+        except Exception:
+            # A broken listener must never fail the write that triggered it
+            logger.exception("Book change listener failed", extra={"action": action})
@@ -0,0 +1,276 @@
+"""
+Precompiled, parameterized query templates for book listing
+
+`get_books` accepts five optional filters, an optional keyset cursor and one
+of a few whitelisted sort orders, so there is a small fixed set of statement
+shapes. Each shape is built once with bind parameters and reused, which
+skips statement construction on every request and keeps SQLAlchemy's
+compiled cache (and asyncpg's prepared statement cache) hitting the same
+entries regardless of the filter values.
+"""
+import base64
+import binascii
+import json
+import uuid
+from datetime import datetime
+from decimal import Decimal
+from functools import lru_cache
+from typing import Optional, Dict, Any, List, Tuple
+from sqlalchemy import select, func, or_, case, tuple_, bindparam, literal_column, Integer, Select
+from models.book_model import Book
+
+DEFAULT_SORT = "created_at"
+
+# Whitelisted sorts: (sort key fields, descending). Every order ends with the
+# unique id_libro in the same direction, so keyset pages can compare whole
+# rows and each order is a single scan of its idx_libros_sort_* index
+# (descending orders walk the index backwards).
+SORTS: Dict[str, Tuple[Tuple[str, ...], bool]] = {
+    "created_at": (("created_at",), True),
+    "updated_at": (("updated_at",), True),
+    "price_asc": (("price",), False),
+    "price_desc": (("price",), True),
+    "name": (("name",), False),
+    "author": (("author",), False),
+    # Only with `q`: rank matches on the title above author/description ones
+    "relevance": (("relevance", "created_at"), True),
+}
+
+# Parse cursor values back to the column's Python type
+_CURSOR_DECODERS = {
+    "created_at": datetime.fromisoformat,
+    "updated_at": datetime.fromisoformat,
+    "price": Decimal,
+    "name": str,
+    "author": str,
+    "relevance": int,
+    "id_libro": lambda value: str(uuid.UUID(value)),
+}
+
+# Escape character of every ILIKE pattern built here (see like_pattern)
+LIKE_ESCAPE = "\\"
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded"""
+
+def _relevance(q):
+    # Inline integer ranks (bound constants would reach Postgres untyped)
+    return case(
+        (Book.name.ilike(q, escape=LIKE_ESCAPE), literal_column("3", Integer)),
+        (Book.author.ilike(q, escape=LIKE_ESCAPE), literal_column("2", Integer)),
+        else_=literal_column("1", Integer)
+    )
+
+def encode_cursor(sort: str, book: Book, relevance: Optional[int] = None) -> str:
+    """Opaque keyset cursor pointing just after `book` in `sort` order"""
+    values: List[Any] = [sort]
+    for field in SORTS[sort][0] + ("id_libro",):
+        value = relevance if field == "relevance" else getattr(book, field)
+        values.append(value.isoformat() if isinstance(value, datetime) else str(value))
+    raw = json.dumps(values, separators=(",", ":"), ensure_ascii=False)
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str, sort: str = DEFAULT_SORT) -> Dict[str, Any]:
+    """
+    Decode a cursor produced by encode_cursor for the same sort
+
+    Returns:
+        Bind parameters ``after_<field>`` holding the last returned row's keys
+    """
+    fields = SORTS[sort][0] + ("id_libro",)
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded).decode())
+        if not isinstance(values, list) or len(values) != len(fields) + 1 or values[0] != sort:
+            raise ValueError("cursor does not match the sort order")
+        return {
+            f"after_{field}": _CURSOR_DECODERS[field](value)
+            for field, value in zip(fields, values[1:])
+        }
+    except (binascii.Error, UnicodeDecodeError, ArithmeticError, TypeError, ValueError) as e:
+        raise InvalidCursorError("Invalid pagination cursor") from e
+
+def like_pattern(value: str) -> str:
+    """
+    Wrap a user value as an ILIKE substring pattern
+
+    `%`, `_` and the escape character are escaped, so the value matches
+    literally (like the catalog snapshot's substring match).
+    """
+    escaped = (
+        value.replace(LIKE_ESCAPE, LIKE_ESCAPE * 2)
+        .replace("%", LIKE_ESCAPE + "%")
+        .replace("_", LIKE_ESCAPE + "_")
+    )
+    return f"%{escaped}%"
+
+def filter_conditions(q=None, author=None, min_price=None, max_price=None, id_user=None) -> List:
+    """
+    WHERE conditions for live books matching the get_books filters
+
+    `q` and `author` are ILIKE patterns (see like_pattern); every argument may be a plain value
+    or a bind parameter. Filters passed as None are not applied.
+    """
+    # Base condition - only non-deleted books
+    conditions = [Book.is_deleted == False]
+
+    # Apply search filter
+    if q is not None:
+        conditions.append(or_(
+            Book.name.ilike(q, escape=LIKE_ESCAPE),
+            Book.description.ilike(q, escape=LIKE_ESCAPE),
+            Book.author.ilike(q, escape=LIKE_ESCAPE)
+        ))
+
+    # Apply author filter
+    if author is not None:
+        conditions.append(Book.author.ilike(author, escape=LIKE_ESCAPE))
+
+    # Apply price filters
+    if min_price is not None:
+        conditions.append(Book.price >= min_price)
+    if max_price is not None:
+        conditions.append(Book.price <= max_price)
+
+    # Apply owner filter (served by idx_libros_user_created_at)
+    if id_user is not None:
+        conditions.append(Book.id_user == id_user)
+
+    return conditions
+
+def value_filter_conditions(
+    q: Optional[str] = None,
+    author: Optional[str] = None,
+    min_price: Optional[float] = None,
+    max_price: Optional[float] = None,
+    id_user: Optional[str] = None
+) -> List:
+    """filter_conditions for literal user values (used by bulk operations)"""
+    return filter_conditions(
+        q=like_pattern(q) if q else None,
+        author=like_pattern(author) if author else None,
+        min_price=min_price,
+        max_price=max_price,
+        id_user=id_user
+    )
+
+def has_value_filters(
+    q: Optional[str] = None,
+    author: Optional[str] = None,
+    min_price: Optional[float] = None,
+    max_price: Optional[float] = None,
+    id_user: Optional[str] = None
+) -> bool:
+    """Whether value_filter_conditions restricts anything beyond live books"""
+    return bool(q or author or id_user) or min_price is not None or max_price is not None
+
+@lru_cache(maxsize=None)
+def list_query_template(
+    has_q: bool,
+    has_author: bool,
+    has_min_price: bool,
+    has_max_price: bool,
+    has_id_user: bool = False,
+    has_cursor: bool = False,
+    sort: str = DEFAULT_SORT
+) -> Tuple[Select, Select]:
+    """
+    Return the (count, page) statements for a filter combination and sort
+
+    Statements use the bind parameters ``q``, ``author``, ``min_price``,
+    ``max_price``, ``id_user``, ``limit`` and either ``offset`` or the
+    keyset parameters ``after_<field>`` (only those that apply). Page rows
+    are (Book,) or, for the relevance sort, (Book, relevance).
+    """
+    price_type = Book.price.type
+    query = select(Book).where(*filter_conditions(
+        q=bindparam("q") if has_q else None,
+        author=bindparam("author") if has_author else None,
+        min_price=bindparam("min_price", type_=price_type) if has_min_price else None,
+        max_price=bindparam("max_price", type_=price_type) if has_max_price else None,
+        id_user=bindparam("id_user", type_=Book.id_user.type) if has_id_user else None
+    ))
+
+    count_query = select(func.count()).select_from(query.subquery())
+
+    fields, descending = SORTS[sort]
+    keys = []
+    cursor_params = []
+    for field in fields + ("id_libro",):
+        if field == "relevance":
+            relevance = _relevance(bindparam("q")).label("relevance")
+            query = query.add_columns(relevance)
+            keys.append(relevance)
+            cursor_params.append(bindparam("after_relevance", type_=Integer()))
+        else:
+            column = getattr(Book, field)
+            keys.append(column)
+            cursor_params.append(bindparam(f"after_{field}", type_=column.type))
+
+    page_query = query.order_by(*(key.desc() if descending else key.asc() for key in keys))
+    if has_cursor:
+        # Keyset: continue strictly after the last row of the previous page
+        row, after = tuple_(*keys), tuple_(*cursor_params)
+        page_query = page_query.where(row < after if descending else row > after)
+    else:
+        page_query = page_query.offset(bindparam("offset"))
+    page_query = page_query.limit(bindparam("limit"))
+
+    return count_query, page_query
+
+def list_query_params(
+    page: int = 1,
+    limit: int = 10,
+    q: Optional[str] = None,
+    author: Optional[str] = None,
+    min_price: Optional[float] = None,
+    max_price: Optional[float] = None,
+    id_user: Optional[str] = None,
+    cursor: Optional[str] = None,
+    sort: str = DEFAULT_SORT
+) -> Tuple[Tuple[Select, Select], Dict[str, Any], Dict[str, Any]]:
+    """
+    Resolve filters to a template and its bind parameters
+
+    With a cursor the page query fetches ``limit + 1`` rows so the caller
+    can tell whether another page follows; `page` is then ignored.
+
+    Returns:
+        Tuple of ((count query, page query), count params, page params)
+
+    Raises:
+        InvalidCursorError: If `cursor` cannot be decoded for `sort`
+        ValueError: If `sort` is unknown, or relevance is requested without `q`
+    """
+    if sort not in SORTS:
+        raise ValueError(f"Unknown sort: {sort}")
+    if sort == "relevance" and not q:
+        raise ValueError("sort=relevance requires a search query (q)")
+
+    template = list_query_template(
+        bool(q),
+        bool(author),
+        min_price is not None,
+        max_price is not None,
+        bool(id_user),
+        bool(cursor),
+        sort
+    )
+
+    params: Dict[str, Any] = {}
+    if q:
+        params["q"] = like_pattern(q)
+    if author:
+        params["author"] = like_pattern(author)
+    if min_price is not None:
+        params["min_price"] = min_price
+    if max_price is not None:
+        params["max_price"] = max_price
+    if id_user:
+        params["id_user"] = id_user
+
+    if cursor:
+        page_params = dict(params, **decode_cursor(cursor, sort), limit=limit + 1)
+    else:
+        page_params = dict(params, offset=(page - 1) * limit, limit=limit)
+    return template, params, page_params
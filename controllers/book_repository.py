@@ -0,0 +1,157 @@
+"""
+Book repository interface and backend selection
+
+Routes depend on `BookRepository` instead of an `AsyncSession`, so the
+storage backend is chosen by BOOK_REPOSITORY: "postgres" (default) runs
+BookController against the database, "memory" keeps books in the process
+(see controllers/memory_repository.py) for tests and benchmarks that must
+not need a running Postgres.
+"""
+from abc import ABC, abstractmethod
+from typing import Optional, Dict, Any, List, AsyncIterator
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from config.database import get_sessionmaker
+from config.settings import settings
+from controllers.book_batcher import book_create_batcher
+from controllers.book_controller import BookController
+from controllers.book_queries import DEFAULT_SORT
+from models.book_model import Book
+from schemas.book_schema import BookCreate, BookUpdate, BookBulkUpdate, BookBulkDelete
+
+class BookRepository(ABC):
+    """
+    Storage operations used by the book routes
+
+    Every backend has the same semantics: only live (not soft-deleted)
+    books are visible, `q`/`author` are case-insensitive substring matches,
+    sorts come from book_queries.SORTS with id_libro as tiebreaker, and
+    pages are addressed by offset or by the opaque keyset cursor.
+    """
+
+    @abstractmethod
+    async def get_books(
+        self,
+        page: int = 1,
+        limit: int = 10,
+        q: Optional[str] = None,
+        author: Optional[str] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        id_user: Optional[str] = None,
+        cursor: Optional[str] = None,
+        sort: str = DEFAULT_SORT,
+        with_total: bool = True
+    ) -> Dict[str, Any]:
+        """Books and pagination info (see BookController.get_books)"""
+
+    @abstractmethod
+    async def suggest(self, prefix: str, limit: int = 5) -> List[Dict[str, Any]]:
+        """Title and author completions for a typed prefix"""
+
+    @abstractmethod
+    async def get_book_by_id(self, book_id: str) -> Optional[Book]:
+        """Live book by UUID, or None"""
+
+    @abstractmethod
+    async def create_book(self, book_data: BookCreate) -> Book:
+        """Create and return a book"""
+
+    @abstractmethod
+    async def update_book(self, book_id: str, book_data: BookUpdate) -> Optional[Book]:
+        """Apply the set fields of `book_data`; None if the book is not live"""
+
+    @abstractmethod
+    async def delete_book(self, book_id: str) -> bool:
+        """Soft delete a book; False if it is not live"""
+
+    @abstractmethod
+    async def bulk_update(self, bulk_data: BookBulkUpdate) -> Dict[str, Any]:
+        """Patch books selected by ID list or filters ({"affected", "dry_run"})"""
+
+    @abstractmethod
+    async def bulk_delete(self, bulk_data: BookBulkDelete) -> Dict[str, Any]:
+        """Soft delete books selected by ID list or filters ({"affected", "dry_run"})"""
+
+    @abstractmethod
+    async def ping(self) -> str:
+        """Check the backend is reachable and return its name"""
+
+class PostgresBookRepository(BookRepository):
+    """BookController on a database session (snapshot, indexes and batching included)"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_books(
+        self,
+        page: int = 1,
+        limit: int = 10,
+        q: Optional[str] = None,
+        author: Optional[str] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        id_user: Optional[str] = None,
+        cursor: Optional[str] = None,
+        sort: str = DEFAULT_SORT,
+        with_total: bool = True
+    ) -> Dict[str, Any]:
+        return await BookController.get_books(
+            db=self.db,
+            page=page,
+            limit=limit,
+            q=q,
+            author=author,
+            min_price=min_price,
+            max_price=max_price,
+            id_user=id_user,
+            cursor=cursor,
+            sort=sort,
+            with_total=with_total
+        )
+
+    async def suggest(self, prefix: str, limit: int = 5) -> List[Dict[str, Any]]:
+        return await BookController.suggest(self.db, prefix, limit)
+
+    async def get_book_by_id(self, book_id: str) -> Optional[Book]:
+        return await BookController.get_book_by_id(self.db, book_id)
+
+    async def create_book(self, book_data: BookCreate) -> Book:
+        if settings.BOOK_CREATE_BATCHING:
+            # Group commit: inserted together with concurrent creates
+            return await book_create_batcher.submit(book_data)
+        return await BookController.create_book(self.db, book_data)
+
+    async def update_book(self, book_id: str, book_data: BookUpdate) -> Optional[Book]:
+        return await BookController.update_book(self.db, book_id, book_data)
+
+    async def delete_book(self, book_id: str) -> bool:
+        return await BookController.delete_book(self.db, book_id)
+
+    async def bulk_update(self, bulk_data: BookBulkUpdate) -> Dict[str, Any]:
+        return await BookController.bulk_update(self.db, bulk_data)
+
+    async def bulk_delete(self, bulk_data: BookBulkDelete) -> Dict[str, Any]:
+        return await BookController.bulk_delete(self.db, bulk_data)
+
+    async def ping(self) -> str:
+        await self.db.execute(text("SELECT 1"))
+        return "postgres"
+
+async def get_book_repository() -> AsyncIterator[BookRepository]:
+    """
+    Dependency returning the configured repository
+    This will be used with FastAPI's Depends()
+    """
+    if settings.BOOK_REPOSITORY == "memory":
+        # Deferred so the Postgres-only deployment never builds the store
+        from controllers.memory_repository import InMemoryBookRepository, memory_store
+        yield InMemoryBookRepository(memory_store)
+        return
+
+    async with get_sessionmaker()() as session:
+        try:
+            yield PostgresBookRepository(session)
+        except Exception:
+            await session.rollback()
+            raise
@@ -0,0 +1,464 @@
+"""
+In-memory, array-backed snapshot of the live catalog
+
+Keeps `id_libro/name/author/price/created_at` for every live book in compact
+columns (stdlib `array`), with a precomputed `created_at` order and a sorted
+price index. `get_books` uses it to answer author/price filters, COUNT and
+pagination from memory; only the page rows are then fetched from Postgres by
+primary key. Free-text `q` searches still go to SQL.
+
+The snapshot follows writes made in this process through `book_events`, and
+writes made by other processes through LISTEN/NOTIFY when the trigger in
+`scripts/catalog_notify.sql` is installed. It is also fully reloaded every
+CATALOG_RELOAD_SECONDS and after every listener reconnect; the new generation
+is built in a worker thread while the current one keeps serving.
+"""
+import asyncio
+import heapq
+import json
+import logging
+import sys
+import uuid
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timezone
+from typing import Optional, Dict, List, Tuple, Iterable
+from sqlalchemy import select, func
+from config.database import get_engine
+from config.settings import settings
+from controllers import book_events
+from models.book_model import Book
+
+logger = logging.getLogger(__name__)
+
+# (id_libro, name, author, price, created_at as epoch seconds)
+CatalogRow = Tuple[str, str, str, float, float]
+
+# Walking created_order costs about an eighth of sorting a candidate row by
+# (created_at, id), so filtered pages walk when the expected walk is shorter
+_WALK_RATIO = 8
+
+class CatalogData:
+    """Columnar storage and indexes for one generation of the snapshot"""
+
+    def __init__(self):
+        self.ids = bytearray()               # 16 bytes per row (UUID)
+        self.names: List[str] = []
+        self.author_of = array("l")          # row -> author slot
+        self.prices = array("d")
+        self.created = array("d")
+        self.alive = bytearray()             # 1 = live, 0 = deleted tombstone
+        self.row_of: Dict[bytes, int] = {}
+        self.live_count = 0
+
+        # Interned authors and the rows written by each one
+        self.authors: List[str] = []
+        self.authors_folded: List[str] = []
+        self.author_slot: Dict[str, int] = {}
+        self.author_rows: List[array] = []
+        self.author_live = array("l")        # live rows per author slot
+
+        # Precomputed orders
+        self.created_order = array("l")      # rows by (created_at, id) ascending
+        self.price_keys = array("d")         # sorted prices of live rows
+        self.price_rows = array("l")         # rows matching price_keys
+
+    def __len__(self):
+        return len(self.alive)
+
+    def _slot_for(self, author: str) -> int:
+        slot = self.author_slot.get(author)
+        if slot is None:
+            slot = len(self.authors)
+            self.author_slot[author] = slot
+            self.authors.append(author)
+            self.authors_folded.append(author.lower())
+            self.author_rows.append(array("l"))
+            self.author_live.append(0)
+        return slot
+
+    def _append(self, key: bytes, name: str, author: str, price: float, created: float) -> int:
+        row = len(self.alive)
+        slot = self._slot_for(author)
+        self.ids += key
+        self.names.append(name)
+        self.author_of.append(slot)
+        self.author_rows[slot].append(row)
+        self.author_live[slot] += 1
+        self.prices.append(price)
+        self.created.append(created)
+        self.alive.append(1)
+        self.row_of[key] = row
+        self.live_count += 1
+        return row
+
+    def extend(self, rows: Iterable[CatalogRow]):
+        """Append rows (call build_orders once every row is in)"""
+        for id_libro, name, author, price, created in rows:
+            self._append(uuid.UUID(id_libro).bytes, name, author, float(price), float(created))
+
+    def build_orders(self, presorted: bool = False):
+        """
+        Build the created_at order and the price index
+
+        Args:
+            presorted: Rows were appended in (created_at, id_libro) order,
+                as reload streams them, so no sort is needed
+        """
+        if presorted:
+            self.created_order = array("l", range(len(self)))
+        else:
+            self.created_order = array("l", sorted(range(len(self)), key=self._order_key))
+        by_price = sorted(range(len(self)), key=self.prices.__getitem__)
+        self.price_rows = array("l", by_price)
+        self.price_keys = array("d", (self.prices[row] for row in by_price))
+
+    def bulk_load(self, rows: Iterable[CatalogRow], presorted: bool = False):
+        """Append rows and build the sort orders in one pass"""
+        self.extend(rows)
+        self.build_orders(presorted)
+
+    def _order_key(self, row: int) -> Tuple[float, bytes]:
+        # Same total order as SQL: created_at, then id_libro (uuid bytes compare like uuids)
+        return self.created[row], bytes(self.ids[row * 16:row * 16 + 16])
+
+    def _price_insert(self, row: int):
+        price = self.prices[row]
+        position = bisect_right(self.price_keys, price)
+        self.price_keys.insert(position, price)
+        self.price_rows.insert(position, row)
+
+    def _price_remove(self, row: int):
+        price = self.prices[row]
+        for position in range(bisect_left(self.price_keys, price), bisect_right(self.price_keys, price)):
+            if self.price_rows[position] == row:
+                del self.price_keys[position]
+                del self.price_rows[position]
+                return
+
+    def upsert(self, id_libro: str, name: str, author: str, price: float, created: float):
+        """Insert a live book or apply changes to an existing one"""
+        key = uuid.UUID(id_libro).bytes
+        row = self.row_of.get(key)
+
+        if row is None:
+            row = self._append(key, name, author, price, created)
+            # New books are almost always the newest: append, else insert in order
+            order_key = (created, key)
+            if not self.created_order or order_key >= self._order_key(self.created_order[-1]):
+                self.created_order.append(row)
+            else:
+                position = bisect_right(self.created_order, order_key, key=self._order_key)
+                self.created_order.insert(position, row)
+            self._price_insert(row)
+            return
+
+        self.names[row] = name
+        if not self.alive[row]:
+            # Revived: back into the price index and the live counts
+            self.alive[row] = 1
+            self.live_count += 1
+            self.author_live[self.author_of[row]] += 1
+            self.prices[row] = price
+            self._price_insert(row)
+        elif self.prices[row] != price:
+            self._price_remove(row)
+            self.prices[row] = price
+            self._price_insert(row)
+
+        slot = self._slot_for(author)
+        if self.author_of[row] != slot:
+            self.author_rows[self.author_of[row]].remove(row)
+            self.author_live[self.author_of[row]] -= 1
+            self.author_rows[slot].append(row)
+            self.author_live[slot] += 1
+            self.author_of[row] = slot
+
+    def remove(self, id_libro: str):
+        """Mark a book as deleted (rows are compacted on the next reload)"""
+        row = self.row_of.get(uuid.UUID(id_libro).bytes)
+        if row is not None and self.alive[row]:
+            self.alive[row] = 0
+            self.live_count -= 1
+            self.author_live[self.author_of[row]] -= 1
+            self._price_remove(row)
+
+    def id_at(self, row: int) -> str:
+        return str(uuid.UUID(bytes=bytes(self.ids[row * 16:row * 16 + 16])))
+
+    def query(
+        self,
+        page: int,
+        limit: int,
+        author: Optional[str] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None
+    ) -> Optional[Tuple[List[str], int]]:
+        """
+        Filter, count and paginate by (created_at, id_libro) descending
+
+        Returns:
+            Tuple of (ids of the requested page, total matching books), or
+            None when an author + price filter would scan more than
+            CATALOG_SNAPSHOT_MAX_SCAN rows (the caller then uses SQL)
+        """
+        alive = self.alive
+        offset = (page - 1) * limit
+
+        if not author and min_price is None and max_price is None:
+            # Unfiltered: walk the precomputed order from the newest book
+            page_rows = []
+            for row in reversed(self.created_order):
+                if not alive[row]:
+                    continue
+                if offset:
+                    offset -= 1
+                    continue
+                page_rows.append(row)
+                if len(page_rows) == limit:
+                    break
+            return [self.id_at(row) for row in page_rows], self.live_count
+
+        prices = self.prices
+        author_of = self.author_of
+        has_price = min_price is not None or max_price is not None
+        low = float("-inf") if min_price is None else min_price
+        high = float("inf") if max_price is None else max_price
+        lo = bisect_left(self.price_keys, low) if min_price is not None else 0
+        hi = bisect_right(self.price_keys, high) if max_price is not None else len(self.price_keys)
+
+        if author:
+            needle = author.lower()
+            slots = [slot for slot, folded in enumerate(self.authors_folded) if needle in folded]
+            wanted = set(slots)
+            author_size = sum(len(self.author_rows[slot]) for slot in slots)
+
+        def author_candidates() -> Iterable[int]:
+            return (
+                row
+                for slot in slots
+                for row in self.author_rows[slot]
+                if alive[row] and low <= prices[row] <= high
+            )
+
+        def price_candidates() -> Iterable[int]:
+            # price_rows only holds live rows
+            if not author:
+                return self.price_rows[lo:hi]
+            return (row for row in self.price_rows[lo:hi] if author_of[row] in wanted)
+
+        # Count without sorting: one filter alone is counted from the indexes,
+        # both together by scanning the smaller candidate set
+        matching = None
+        if not author:
+            total = hi - lo
+            candidates = price_candidates
+        elif not has_price:
+            total = sum(self.author_live[slot] for slot in slots)
+            candidates = author_candidates
+        else:
+            candidates = author_candidates if author_size <= hi - lo else price_candidates
+            if min(author_size, hi - lo) > settings.CATALOG_SNAPSHOT_MAX_SCAN:
+                return None
+            matching = list(candidates())
+            total = len(matching)
+
+        end = offset + limit
+        if offset >= total:
+            return [], total
+
+        if end * len(self.created_order) <= total * total * _WALK_RATIO:
+            # Matches are common: walk from the newest book until the page is full
+            page_rows = []
+            for row in reversed(self.created_order):
+                if not alive[row] or not low <= prices[row] <= high:
+                    continue
+                if author and author_of[row] not in wanted:
+                    continue
+                if offset:
+                    offset -= 1
+                    continue
+                page_rows.append(row)
+                if len(page_rows) == limit:
+                    break
+        else:
+            # Matches are rare: keep the newest `end` candidates
+            rows = matching if matching is not None else candidates()
+            page_rows = heapq.nlargest(end, rows, key=self._order_key)[offset:]
+        return [self.id_at(row) for row in page_rows], total
+
+    def memory_usage(self) -> Dict[str, float]:
+        """Approximate resident bytes of the snapshot"""
+        total = sum(sys.getsizeof(column) for column in (
+            self.ids, self.author_of, self.author_live, self.prices, self.created, self.alive,
+            self.created_order, self.price_keys, self.price_rows,
+        ))
+        total += sys.getsizeof(self.names) + sum(sys.getsizeof(name) for name in self.names)
+        total += sys.getsizeof(self.row_of) + sum(sys.getsizeof(key) for key in self.row_of)
+        total += sum(sys.getsizeof(a) + sys.getsizeof(f) for a, f in zip(self.authors, self.authors_folded))
+        total += sum(sys.getsizeof(rows) for rows in self.author_rows)
+        rows = len(self) or 1
+        return {"rows": len(self), "total_bytes": total, "bytes_per_row": total / rows}
+
+class CatalogSnapshot:
+    """Process-wide snapshot with loading, change feed and query entry point"""
+
+    def __init__(self):
+        self.data = CatalogData()
+        self.ready = False
+        self.loaded_at: Optional[datetime] = None
+        self._loading = False
+        self._pending: List[Tuple[str, tuple]] = []
+        self._task: Optional[asyncio.Task] = None
+        self._reload_requested = asyncio.Event()
+
+    # Change feed -----------------------------------------------------------
+
+    def _apply(self, op: str, args: tuple):
+        if self._loading:
+            # Replayed on the new generation once the reload finishes
+            self._pending.append((op, args))
+        if op == "upsert":
+            self.data.upsert(*args)
+        else:
+            self.data.remove(*args)
+
+    def on_book_event(self, action: str, book=None):
+        """book_events listener for writes made by this process"""
+        if action == "invalidate":
+            self.ready = False
+            self.schedule_reload()
+            return
+        if book is None:
+            return
+        if book.is_deleted:
+            self._apply("remove", (book.id_libro,))
+        else:
+            created_at = book.created_at
+            if created_at.tzinfo is None:
+                # TIMESTAMP columns come back naive; Postgres epochs treat them as UTC
+                created_at = created_at.replace(tzinfo=timezone.utc)
+            self._apply("upsert", (
+                book.id_libro, book.name, book.author, float(book.price), created_at.timestamp()
+            ))
+
+    def on_notify(self, connection, pid, channel, payload):
+        """asyncpg NOTIFY callback for writes made by other processes"""
+        change = json.loads(payload)
+        if change["op"] == "DELETE" or change["is_deleted"]:
+            self._apply("remove", (change["id_libro"],))
+        else:
+            self._apply("upsert", (
+                change["id_libro"], change["name"], change["author"],
+                float(change["price"]), float(change["created_at"])
+            ))
+
+    # Loading ---------------------------------------------------------------
+
+    async def reload(self) -> Dict[str, float]:
+        """
+        Load every live book into a fresh generation and swap it in
+
+        Rows arrive in (created_at, id_libro) order from idx_libros_sort_created_at
+        and each streamed partition goes straight into the new columns; that and
+        building the price index run in a worker thread, so requests keep being
+        served from the current generation meanwhile.
+
+        Returns:
+            memory_usage() of the new generation
+        """
+        self._loading = True
+        self._pending = []
+        try:
+            data = CatalogData()
+            query = select(
+                Book.id_libro, Book.name, Book.author, Book.price,
+                func.extract("epoch", Book.created_at)
+            ).where(Book.is_deleted == False).order_by(Book.created_at, Book.id_libro)
+
+            async with get_engine().connect() as conn:
+                result = await conn.stream(query.execution_options(yield_per=10000))
+                async for partition in result.partitions():
+                    await asyncio.to_thread(data.extend, partition)
+            await asyncio.to_thread(data.build_orders, True)
+            memory = await asyncio.to_thread(data.memory_usage)
+
+            for op, args in self._pending:
+                if op == "upsert":
+                    data.upsert(*args)
+                else:
+                    data.remove(*args)
+            self.data = data
+            self.ready = True
+            self.loaded_at = datetime.now()
+            return memory
+        finally:
+            self._loading = False
+            self._pending = []
+
+    def schedule_reload(self):
+        """Request a full reload from the background task"""
+        if self._task is not None and not self._task.done():
+            self._reload_requested.set()
+
+    async def _run(self):
+        """Hold a LISTEN connection and reload on (re)connect and periodically"""
+        while True:
+            try:
+                async with get_engine().connect() as conn:
+                    raw = await conn.get_raw_connection()
+                    driver = raw.driver_connection
+                    await driver.add_listener(settings.CATALOG_NOTIFY_CHANNEL, self.on_notify)
+                    try:
+                        while True:
+                            self._reload_requested.clear()
+                            memory = await self.reload()
+                            logger.info(
+                                "Catalog snapshot loaded: %d books", memory["rows"],
+                                extra={"bytes_per_row": round(memory["bytes_per_row"])}
+                            )
+                            try:
+                                await asyncio.wait_for(
+                                    self._reload_requested.wait(),
+                                    settings.CATALOG_RELOAD_SECONDS or None
+                                )
+                            except asyncio.TimeoutError:
+                                pass
+                    finally:
+                        await driver.remove_listener(settings.CATALOG_NOTIFY_CHANNEL, self.on_notify)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self.ready = False
+                logger.exception("Catalog snapshot unavailable, retrying")
+                await asyncio.sleep(5)
+
+    def start(self):
+        """Start loading and following changes in the background"""
+        book_events.subscribe(self.on_book_event)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        book_events.unsubscribe(self.on_book_event)
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    # Queries ---------------------------------------------------------------
+
+    def can_answer(self, q: Optional[str], id_user: Optional[str] = None, sort: str = "created_at") -> bool:
+        """Whether a get_books call can be served from memory"""
+        # Owner pages go to idx_libros_user_created_at (owners are not kept
+        # here); only the default newest-first order is precomputed
+        return self.ready and not q and not id_user and sort == "created_at"
+
+    def query(self, page: int, limit: int, author=None, min_price=None, max_price=None):
+        return self.data.query(page, limit, author, min_price, max_price)
+
+# Global snapshot instance (used when CATALOG_SNAPSHOT_ENABLED is set)
+catalog_snapshot = CatalogSnapshot()
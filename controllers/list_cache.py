@@ -0,0 +1,231 @@
+"""
+Result cache for book list/search responses
+
+Entries are keyed by the normalized list parameters and hold the final
+JSON bytes (plus lazily built compressed variants), so a hit skips the
+COUNT, the page query and serialization. Entries expire after a TTL, the
+cache is bounded by entry count and total bytes (LRU eviction), and every
+committed write bumps a generation counter that drops all entries.
+
+Writes made by other worker processes arrive through LISTEN on
+CATALOG_NOTIFY_CHANNEL (trigger in `scripts/catalog_notify.sql`, shared
+with the catalog snapshot). Without the trigger, or while the listener is
+reconnecting, such writes are only seen after LIST_CACHE_TTL_SECONDS.
+"""
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from decimal import Decimal
+from typing import Optional, Dict, Any, Tuple
+from starlette.responses import Response
+from config.settings import settings
+from controllers import book_events
+from middleware.compression import negotiate_encoding, compress_body
+
+logger = logging.getLogger(__name__)
+
+class CacheEntry:
+    """Serialized response and its pre-compressed variants"""
+
+    __slots__ = ("body", "expires_at", "encoded", "cached")
+
+    def __init__(self, body: bytes, expires_at: float):
+        self.body = body
+        self.expires_at = expires_at
+        self.encoded: Dict[str, bytes] = {}
+        self.cached = False
+
+    @property
+    def size(self) -> int:
+        return len(self.body) + sum(len(value) for value in self.encoded.values())
+
+class ListResultCache:
+    """TTL + LRU cache of list responses with generation-based invalidation"""
+
+    # Parameters whose case does not change the result (ILIKE filters, UUIDs);
+    # cursors are case-sensitive base64 and are kept as given
+    CASE_INSENSITIVE = frozenset({"q", "author", "id_user"})
+
+    def __init__(self, max_entries: int, max_bytes: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl_seconds
+        self.generation = 0
+        self._entries: "OrderedDict[Tuple, CacheEntry]" = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.listening = False
+        self._task: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def make_key(**params: Any) -> Tuple:
+        """
+        Normalize list parameters into a cache key
+
+        Text filters are matched with ILIKE, so case does not change the
+        result and empty strings mean "no filter"; prices are compared as
+        decimals (10 == 10.0).
+        """
+        key = []
+        for name in sorted(params):
+            value = params[name]
+            if isinstance(value, str):
+                value = (value.lower() if name in ListResultCache.CASE_INSENSITIVE else value) or None
+            elif isinstance(value, (float, Decimal)):
+                value = Decimal(str(value)).normalize()
+            key.append((name, value))
+        return tuple(key)
+
+    def get(self, key: Tuple) -> Optional[CacheEntry]:
+        """Return a fresh entry (marking it recently used) or None"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        if entry.expires_at < time.monotonic():
+            self._drop(key)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key: Tuple, body: bytes, generation: int) -> CacheEntry:
+        """
+        Store a response computed while `generation` was current
+
+        Results computed across a write (generation changed meanwhile) are
+        returned but not stored.
+        """
+        entry = CacheEntry(body, time.monotonic() + self.ttl)
+        if generation != self.generation or len(body) > self.max_bytes:
+            return entry
+        if key in self._entries:
+            self._drop(key)
+        self._entries[key] = entry
+        entry.cached = True
+        self._bytes += entry.size
+        self._evict()
+        return entry
+
+    def invalidate(self):
+        """Drop every entry (called after any committed write)"""
+        self.generation += 1
+        self.invalidations += 1
+        for entry in self._entries.values():
+            entry.cached = False
+        self._entries.clear()
+        self._bytes = 0
+
+    def on_book_event(self, action: str, book=None):
+        """book_events listener: any change to libros invalidates all lists"""
+        self.invalidate()
+
+    def on_notify(self, connection, pid, channel, payload):
+        """asyncpg NOTIFY callback: a write committed by any process"""
+        self.invalidate()
+
+    async def _listen(self):
+        """Hold a LISTEN connection so writes from other workers invalidate"""
+        from config.database import get_engine
+
+        while True:
+            try:
+                async with get_engine().connect() as conn:
+                    raw = await conn.get_raw_connection()
+                    driver = raw.driver_connection
+                    await driver.add_listener(settings.CATALOG_NOTIFY_CHANNEL, self.on_notify)
+                    # Writes may have been missed while not listening
+                    self.invalidate()
+                    self.listening = True
+                    try:
+                        while not driver.is_closed():
+                            await asyncio.sleep(5)
+                    finally:
+                        self.listening = False
+                        if not driver.is_closed():
+                            await driver.remove_listener(settings.CATALOG_NOTIFY_CHANNEL, self.on_notify)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("List cache change listener unavailable, retrying")
+            await asyncio.sleep(5)
+
+    def start(self):
+        """Follow writes made by other processes (LISTEN) in the background"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._listen())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def _drop(self, key: Tuple):
+        entry = self._entries.pop(key)
+        entry.cached = False
+        self._bytes -= entry.size
+
+    def _evict(self):
+        # Least recently used entries go first
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            self._drop(next(iter(self._entries)))
+            self.evictions += 1
+
+    def response(self, entry: CacheEntry, accept_encoding: Optional[str]) -> Response:
+        """
+        Build the HTTP response for an entry, reusing compressed bytes
+
+        The compression middleware passes responses that already carry a
+        Content-Encoding through untouched.
+        """
+        encoding = None
+        if settings.COMPRESSION_ENABLED and len(entry.body) >= settings.COMPRESSION_MINIMUM_SIZE:
+            encoding = negotiate_encoding(accept_encoding)
+        if encoding is None:
+            return Response(content=entry.body, media_type="application/json")
+
+        body = entry.encoded.get(encoding)
+        if body is None:
+            body = compress_body(entry.body, encoding)
+            entry.encoded[encoding] = body
+            if entry.cached:
+                self._bytes += len(body)
+                self._evict()
+        return Response(
+            content=body,
+            media_type="application/json",
+            headers={"Content-Encoding": encoding, "Vary": "Accept-Encoding"}
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit-ratio and size metrics"""
+        lookups = self.hits + self.misses
+        return {
+            "enabled": settings.LIST_CACHE_ENABLED,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "generation": self.generation,
+            "listening": self.listening,
+        }
+
+# Global cache instance (used when LIST_CACHE_ENABLED is set)
+list_cache = ListResultCache(
+    max_entries=settings.LIST_CACHE_MAX_ENTRIES,
+    max_bytes=settings.LIST_CACHE_MAX_BYTES,
+    ttl_seconds=settings.LIST_CACHE_TTL_SECONDS
+)
+book_events.subscribe(list_cache.on_book_event)
@@ -0,0 +1,388 @@
+"""
+In-memory book repository
+
+Keeps Book objects in a dict with the same filtering (ILIKE patterns),
+sorting, offset/keyset pagination, soft-delete and bulk semantics as the
+Postgres repository, so the API can run, be tested and be benchmarked with
+no database. Data lives in the process and is lost on restart, and text
+sorts use code point order rather than the database collation.
+"""
+import math
+import re
+import uuid
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timezone
+from decimal import Decimal, ROUND_HALF_UP
+from functools import lru_cache
+from itertools import islice
+from operator import itemgetter
+from typing import Optional, Dict, Any, List, Tuple, Iterable, Callable
+from controllers import book_events
+from controllers.book_queries import (
+    SORTS, DEFAULT_SORT, encode_cursor, decode_cursor, like_pattern, has_value_filters
+)
+from controllers.book_repository import BookRepository
+from controllers.suggest_index import SuggestIndex
+from models.book_model import Book
+from schemas.book_schema import BookCreate, BookUpdate, BookBulkUpdate, BookBulkDelete
+
+# Columns declared NOT NULL on libros
+_REQUIRED_FIELDS = ("name", "author", "price")
+
+@lru_cache(maxsize=1024)
+def _like_regex(pattern: str) -> "re.Pattern":
+    """Compile a LIKE pattern (%, _ and backslash escapes) to a case-insensitive regex"""
+    parts = []
+    escaped = False
+    for char in pattern:
+        if escaped:
+            parts.append(re.escape(char))
+            escaped = False
+        elif char == "\\":
+            escaped = True
+        elif char == "%":
+            parts.append(".*")
+        elif char == "_":
+            parts.append(".")
+        else:
+            parts.append(re.escape(char))
+    return re.compile("".join(parts), re.IGNORECASE | re.DOTALL)
+
+def _ilike(value: Optional[str], pattern: str) -> bool:
+    return value is not None and _like_regex(pattern).fullmatch(value) is not None
+
+def _canonical_uuid(value: str) -> str:
+    """Postgres' text form of a UUID (raises ValueError when malformed)"""
+    return str(uuid.UUID(value))
+
+def _to_price(value) -> Decimal:
+    """Round like NUMERIC(10,2)"""
+    return Decimal(str(value)).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+
+def _relevance(book: Book, q_pattern: str) -> int:
+    # Same ranks as book_queries._relevance
+    if _ilike(book.name, q_pattern):
+        return 3
+    if _ilike(book.author, q_pattern):
+        return 2
+    return 1
+
+def _matcher(
+    q: Optional[str] = None,
+    author: Optional[str] = None,
+    min_price=None,
+    max_price=None,
+    id_user: Optional[str] = None
+) -> Callable[[Book], bool]:
+    """book_queries.filter_conditions as a predicate over live books"""
+    q_regex = _like_regex(like_pattern(q)) if q else None
+    author_regex = _like_regex(like_pattern(author)) if author else None
+    low = _to_price(min_price) if min_price is not None else None
+    high = _to_price(max_price) if max_price is not None else None
+    owner = _canonical_uuid(id_user) if id_user else None
+
+    def matches(book: Book) -> bool:
+        if book.is_deleted:
+            return False
+        if q_regex is not None and not any(
+            value is not None and q_regex.fullmatch(value)
+            for value in (book.name, book.description, book.author)
+        ):
+            return False
+        if author_regex is not None and not (book.author is not None and author_regex.fullmatch(book.author)):
+            return False
+        if low is not None and book.price < low:
+            return False
+        if high is not None and book.price > high:
+            return False
+        if owner is not None and book.id_user != owner:
+            return False
+        return True
+
+    return matches
+
+def _sort_key(book: Book, fields: Tuple[str, ...], q_pattern: Optional[str] = None) -> tuple:
+    """Values of `fields` plus the id_libro tiebreaker (uuid order, as in SQL)"""
+    values = [
+        _relevance(book, q_pattern) if field == "relevance" else getattr(book, field)
+        for field in fields
+    ]
+    return (*values, uuid.UUID(book.id_libro))
+
+class InMemoryBookStore:
+    """Process-wide book storage shared by every InMemoryBookRepository"""
+
+    def __init__(self):
+        self.books: Dict[str, Book] = {}
+        self.suggestions = SuggestIndex()
+        # Live books in ascending order per sort, rebuilt lazily after writes
+        # (the in-memory counterpart of the idx_libros_sort_* indexes)
+        self.version = 0
+        self._orders: Dict[str, Tuple[int, List[tuple], List[Book]]] = {}
+
+    def clear(self):
+        """Drop every book"""
+        self.books.clear()
+        self.suggestions = SuggestIndex()
+        self.version += 1
+
+    def load(self, books: Iterable[Book]):
+        """Insert fully built Book objects as-is (e.g. benchmark fixtures)"""
+        for book in books:
+            self.books[book.id_libro] = book
+        self.suggestions.bulk_load(
+            (book.id_libro, book.name, book.author)
+            for book in self.books.values() if not book.is_deleted
+        )
+        self.version += 1
+
+    def changed(self, book: Book):
+        """Record a write: update the suggestion index and drop cached orders"""
+        if book.is_deleted:
+            self.suggestions.remove_book(book.id_libro)
+        else:
+            self.suggestions.add_book(book.id_libro, book.name, book.author)
+        self.version += 1
+
+    def ordered(self, sort: str) -> Tuple[List[tuple], List[Book]]:
+        """Sort keys and live books in ascending `sort` order (any sort but relevance)"""
+        cached = self._orders.get(sort)
+        if cached is not None and cached[0] == self.version:
+            return cached[1], cached[2]
+
+        fields = SORTS[sort][0]
+        pairs = sorted(
+            ((_sort_key(book, fields), book) for book in self.books.values() if not book.is_deleted),
+            key=itemgetter(0)
+        )
+        keys = [key for key, _ in pairs]
+        books = [book for _, book in pairs]
+        self._orders[sort] = (self.version, keys, books)
+        return keys, books
+
+class InMemoryBookRepository(BookRepository):
+    """BookRepository over an InMemoryBookStore"""
+
+    def __init__(self, store: "InMemoryBookStore"):
+        self.store = store
+
+    async def get_books(
+        self,
+        page: int = 1,
+        limit: int = 10,
+        q: Optional[str] = None,
+        author: Optional[str] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        id_user: Optional[str] = None,
+        cursor: Optional[str] = None,
+        sort: str = DEFAULT_SORT,
+        with_total: bool = True
+    ) -> Dict[str, Any]:
+        if sort not in SORTS:
+            raise ValueError(f"Unknown sort: {sort}")
+        if sort == "relevance" and not q:
+            raise ValueError("sort=relevance requires a search query (q)")
+
+        fields, descending = SORTS[sort]
+        q_pattern = like_pattern(q) if q else None
+        filters = dict(q=q, author=author, min_price=min_price, max_price=max_price, id_user=id_user)
+        matches = _matcher(**filters)
+        if sort == "relevance":
+            # Ranks depend on q, so only the matching books are ordered
+            pairs = sorted(
+                (
+                    (_sort_key(book, fields, q_pattern), book)
+                    for book in self.store.books.values() if matches(book)
+                ),
+                key=itemgetter(0)
+            )
+            keys = [key for key, _ in pairs]
+            books = [book for _, book in pairs]
+            filtered = False
+        else:
+            keys, books = self.store.ordered(sort)
+            filtered = any(value not in (None, "") for value in filters.values())
+
+        # Positions in result order, strictly after the cursor row if any
+        if cursor:
+            after = decode_cursor(cursor, sort)
+            after_key = (
+                *(after[f"after_{field}"] for field in fields),
+                uuid.UUID(after["after_id_libro"])
+            )
+            if descending:
+                positions = range(bisect_left(keys, after_key) - 1, -1, -1)
+            else:
+                positions = range(bisect_right(keys, after_key), len(keys))
+        else:
+            positions = range(len(keys) - 1, -1, -1) if descending else range(len(keys))
+
+        def matching() -> Iterable[Book]:
+            for position in positions:
+                book = books[position]
+                if not filtered or matches(book):
+                    yield book
+
+        def next_cursor(book: Book) -> str:
+            relevance = _relevance(book, q_pattern) if sort == "relevance" else None
+            return encode_cursor(sort, book, relevance)
+
+        if cursor or not with_total:
+            # One extra row tells whether another page follows
+            skip = 0 if cursor else (page - 1) * limit
+            page_books = list(islice(matching(), skip, skip + limit + 1))
+            has_more = len(page_books) > limit
+            page_books = page_books[:limit]
+            return {
+                "books": page_books,
+                "pagination": {
+                    "page": None if cursor else page,
+                    "limit": limit,
+                    "total": None,
+                    "total_pages": None,
+                    "next_cursor": next_cursor(page_books[-1]) if has_more else None
+                }
+            }
+
+        offset = (page - 1) * limit
+        if filtered:
+            matched = list(matching())
+            total = len(matched)
+            page_books = matched[offset:offset + limit]
+        else:
+            total = len(positions)
+            page_books = [books[position] for position in positions[offset:offset + limit]]
+        return {
+            "books": page_books,
+            "pagination": {
+                "page": page,
+                "limit": limit,
+                "total": total,
+                "total_pages": math.ceil(total / limit) if total > 0 else 0,
+                "next_cursor": next_cursor(page_books[-1]) if page_books and page * limit < total else None
+            }
+        }
+
+    async def suggest(self, prefix: str, limit: int = 5) -> List[Dict[str, Any]]:
+        return self.store.suggestions.suggest(prefix, limit)
+
+    async def get_book_by_id(self, book_id: str) -> Optional[Book]:
+        try:
+            book = self.store.books.get(_canonical_uuid(book_id))
+        except ValueError:
+            raise Exception("Invalid UUID format")
+        return book if book is not None and not book.is_deleted else None
+
+    def _apply(self, book: Book, values: Dict[str, Any], now: datetime):
+        for field, value in values.items():
+            if field == "price":
+                value = _to_price(value)
+            elif field == "id_user" and value is not None:
+                value = _canonical_uuid(value)
+            setattr(book, field, value)
+        book.updated_at = now
+        self.store.changed(book)
+
+    @staticmethod
+    def _check_values(values: Dict[str, Any]):
+        # Fail before touching any book, like a NOT NULL / uuid error in SQL
+        for field in _REQUIRED_FIELDS:
+            if field in values and values[field] is None:
+                raise Exception(f"Database error: null value in column \"{field}\" violates not-null constraint")
+        if values.get("id_user") is not None:
+            try:
+                _canonical_uuid(values["id_user"])
+            except ValueError:
+                raise Exception("Database error: invalid input syntax for type uuid")
+
+    async def create_book(self, book_data: BookCreate) -> Book:
+        self._check_values({"id_user": book_data.id_user})
+        now = datetime.now(timezone.utc)
+        book = Book(
+            id_libro=str(uuid.uuid4()),
+            name=book_data.name,
+            author=book_data.author,
+            price=_to_price(book_data.price),
+            description=book_data.description,
+            id_user=_canonical_uuid(book_data.id_user) if book_data.id_user else None,
+            is_deleted=False,
+            created_at=now,
+            updated_at=now
+        )
+        self.store.books[book.id_libro] = book
+        self.store.changed(book)
+        book_events.notify("created", book)
+        return book
+
+    async def update_book(self, book_id: str, book_data: BookUpdate) -> Optional[Book]:
+        book = await self.get_book_by_id(book_id)
+        if not book:
+            return None
+
+        update_data = book_data.model_dump(exclude_unset=True)
+        self._check_values(update_data)
+        self._apply(book, update_data, datetime.now(timezone.utc))
+        book_events.notify("updated", book)
+        return book
+
+    async def delete_book(self, book_id: str) -> bool:
+        book = await self.get_book_by_id(book_id)
+        if not book:
+            return False
+
+        self._apply(book, {"is_deleted": True}, datetime.now(timezone.utc))
+        book_events.notify("deleted", book)
+        return True
+
+    def _bulk_apply(
+        self,
+        values: Dict[str, Any],
+        ids: Optional[List[str]] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        dry_run: bool = False
+    ) -> int:
+        if ids is not None:
+            try:
+                keys = list(dict.fromkeys(_canonical_uuid(book_id) for book_id in ids))
+            except ValueError:
+                raise Exception("Invalid UUID format")
+            targets = [
+                self.store.books[key] for key in keys
+                if key in self.store.books and not self.store.books[key].is_deleted
+            ]
+        else:
+            if not has_value_filters(**filters):
+                raise Exception("Bulk filter must set at least one criterion")
+            matches = _matcher(**filters)
+            targets = [book for book in self.store.books.values() if matches(book)]
+
+        if dry_run or not targets:
+            return len(targets)
+
+        self._check_values(values)
+        now = datetime.now(timezone.utc)
+        for book in targets:
+            self._apply(book, values, now)
+        # Any number of rows changed: in-memory caches rebuild
+        book_events.notify("invalidate")
+        return len(targets)
+
+    async def bulk_update(self, bulk_data: BookBulkUpdate) -> Dict[str, Any]:
+        values = bulk_data.patch.model_dump(exclude_unset=True)
+        filters = bulk_data.filter.model_dump() if bulk_data.filter else None
+        affected = self._bulk_apply(values, ids=bulk_data.ids, filters=filters, dry_run=bulk_data.dry_run)
+        return {"affected": affected, "dry_run": bulk_data.dry_run}
+
+    async def bulk_delete(self, bulk_data: BookBulkDelete) -> Dict[str, Any]:
+        filters = bulk_data.filter.model_dump() if bulk_data.filter else None
+        affected = self._bulk_apply(
+            {"is_deleted": True}, ids=bulk_data.ids, filters=filters, dry_run=bulk_data.dry_run
+        )
+        return {"affected": affected, "dry_run": bulk_data.dry_run}
+
+    async def ping(self) -> str:
+        return "memory"
+
+# Global store (used when BOOK_REPOSITORY=memory)
+memory_store = InMemoryBookStore()
@@ -0,0 +1,231 @@
+"""
+In-memory prefix index for title and author typeahead
+
+Every word start of each live title and author is stored as a normalized
+key (lower case, Spanish accents and other diacritics removed) in a sorted
+list, so a prefix lookup is a binary search plus a short forward scan.
+The index follows writes in this process through `book_events` and is
+rebuilt every SUGGEST_RELOAD_SECONDS to pick up writes from other processes;
+rebuilds run in a worker thread while the current index keeps serving.
+"""
+import asyncio
+import logging
+import unicodedata
+from bisect import bisect_left
+from typing import Optional, Dict, List, Tuple
+from sqlalchemy import select
+from config.database import get_engine
+from config.settings import settings
+from controllers import book_events
+from models.book_model import Book
+
+logger = logging.getLogger(__name__)
+
+# Suggestion kinds
+TITLE = "title"
+AUTHOR = "author"
+
+def normalize(value: str) -> str:
+    """Lower-case, strip diacritics (á -> a, ñ -> n) and collapse whitespace"""
+    decomposed = unicodedata.normalize("NFKD", value)
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return " ".join(stripped.casefold().split())
+
+class SuggestIndex:
+    """Sorted prefix keys over titles and authors with live-book counts"""
+
+    def __init__(self):
+        self._reset()
+        self.ready = False
+        self._loading = False
+        self._pending: List[Tuple[str, object]] = []
+        self._task: Optional[asyncio.Task] = None
+        self._reload_requested = asyncio.Event()
+
+    def _reset(self):
+        self.keys: List[str] = []
+        self.entries: List[Tuple[str, str]] = []       # (kind, display) per key
+        self.counts: Dict[Tuple[str, str], int] = {}   # live books per entry
+        self.books: Dict[str, Tuple[str, str]] = {}    # id_libro -> (name, author)
+
+    @staticmethod
+    def _word_keys(display: str) -> List[str]:
+        """Keys for the whole text and for every later word start"""
+        words = normalize(display).split(" ")
+        return [" ".join(words[i:]) for i in range(len(words)) if words[i]]
+
+    def _add_entry(self, kind: str, display: str):
+        entry = (kind, display)
+        self.counts[entry] = self.counts.get(entry, 0) + 1
+        if self.counts[entry] > 1:
+            return
+        for key in self._word_keys(display):
+            position = bisect_left(self.keys, key)
+            self.keys.insert(position, key)
+            self.entries.insert(position, entry)
+
+    def _remove_entry(self, kind: str, display: str):
+        entry = (kind, display)
+        remaining = self.counts.get(entry, 0) - 1
+        if remaining > 0:
+            self.counts[entry] = remaining
+            return
+        self.counts.pop(entry, None)
+        for key in self._word_keys(display):
+            position = bisect_left(self.keys, key)
+            while position < len(self.keys) and self.keys[position] == key:
+                if self.entries[position] == entry:
+                    del self.keys[position]
+                    del self.entries[position]
+                    break
+                position += 1
+
+    def add_book(self, id_libro: str, name: str, author: str):
+        """Index a live book (replacing its previous title/author if known)"""
+        self.remove_book(id_libro)
+        self.books[id_libro] = (name, author)
+        self._add_entry(TITLE, name)
+        self._add_entry(AUTHOR, author)
+
+    def remove_book(self, id_libro: str):
+        """Drop a book's title/author references"""
+        previous = self.books.pop(id_libro, None)
+        if previous is not None:
+            self._remove_entry(TITLE, previous[0])
+            self._remove_entry(AUTHOR, previous[1])
+
+    def extend(self, rows):
+        """Count (id_libro, name, author) rows (call build_keys once every row is in)"""
+        for id_libro, name, author in rows:
+            self.books[id_libro] = (name, author)
+            for entry in ((TITLE, name), (AUTHOR, author)):
+                self.counts[entry] = self.counts.get(entry, 0) + 1
+
+    def build_keys(self):
+        """Build the sorted prefix keys for every counted entry in one sort"""
+        pairs = sorted(
+            (key, entry)
+            for entry in self.counts
+            for key in self._word_keys(entry[1])
+        )
+        self.keys = [key for key, _ in pairs]
+        self.entries = [entry for _, entry in pairs]
+
+    def bulk_load(self, rows):
+        """Build the index from (id_libro, name, author) rows in one sort"""
+        self._reset()
+        self.extend(rows)
+        self.build_keys()
+
+    def suggest(self, prefix: str, limit: int = 5) -> List[Dict[str, str]]:
+        """
+        Top completions for a prefix, most common first
+
+        Args:
+            prefix: Text typed so far
+            limit: Maximum suggestions
+
+        Returns:
+            List of {"text", "type", "count"} dictionaries
+        """
+        needle = normalize(prefix)
+        if not needle:
+            return []
+
+        # Scan a bounded window of matches, then rank by number of live books
+        found: Dict[Tuple[str, str], int] = {}
+        position = bisect_left(self.keys, needle)
+        scan_limit = max(limit * 20, 100)
+        while position < len(self.keys) and len(found) < scan_limit:
+            if not self.keys[position].startswith(needle):
+                break
+            entry = self.entries[position]
+            found[entry] = self.counts.get(entry, 0)
+            position += 1
+
+        ranked = sorted(found.items(), key=lambda item: (-item[1], normalize(item[0][1])))
+        return [
+            {"text": display, "type": kind, "count": count}
+            for (kind, display), count in ranked[:limit]
+        ]
+
+    # Loading and change feed -----------------------------------------------
+
+    def on_book_event(self, action: str, book=None):
+        """book_events listener for writes made by this process"""
+        if action == "invalidate":
+            # Unknown set of rows changed: serve from SQL until rebuilt
+            self.ready = False
+            self._reload_requested.set()
+            return
+        if book is None:
+            return
+        change = (book.id_libro, None if book.is_deleted else (book.name, book.author))
+        if self._loading:
+            # Replayed on the rebuilt index once the reload finishes
+            self._pending.append(change)
+        if self.ready:
+            self._apply(*change)
+
+    def _apply(self, id_libro: str, fields: Optional[Tuple[str, str]]):
+        if fields is None:
+            self.remove_book(id_libro)
+        else:
+            self.add_book(id_libro, *fields)
+
+    async def reload(self):
+        """Rebuild the index from every live book"""
+        query = select(Book.id_libro, Book.name, Book.author).where(Book.is_deleted == False)
+        self._loading = True
+        self._pending = []
+        try:
+            # Built off the event loop, one streamed partition at a time
+            index = SuggestIndex()
+            async with get_engine().connect() as conn:
+                result = await conn.stream(query.execution_options(yield_per=10000))
+                async for partition in result.partitions():
+                    await asyncio.to_thread(index.extend, partition)
+            await asyncio.to_thread(index.build_keys)
+
+            for change in self._pending:
+                index._apply(*change)
+            self.keys, self.entries = index.keys, index.entries
+            self.counts, self.books = index.counts, index.books
+            self.ready = True
+        finally:
+            self._loading = False
+            self._pending = []
+
+    async def _run(self):
+        while True:
+            self._reload_requested.clear()
+            try:
+                await self.reload()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self.ready = False
+                logger.exception("Suggest index reload failed")
+            try:
+                await asyncio.wait_for(self._reload_requested.wait(), settings.SUGGEST_RELOAD_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self):
+        """Build the index and keep it current in the background"""
+        book_events.subscribe(self.on_book_event)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        book_events.unsubscribe(self.on_book_event)
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+# Global index instance (used when SUGGEST_INDEX_ENABLED is set)
+suggest_index = SuggestIndex()
@@ -3,16 +3,54 @@ Main FastAPI application
 """
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
-import uvicorn
+import asyncio
+import logging
+import sys
 
 # Import routers
 from api.health import router as health_router
 from api.books import router as books_router
+from api.users import router as users_router
 
 # Import database setup
-from config.database import create_tables
+from config.database import create_tables, warm_pool, dispose_engine
+from config.log_config import setup_logging
 from config.settings import settings
+from controllers.book_batcher import book_create_batcher
+from controllers.book_queries import list_query_params
+from controllers.list_cache import list_cache
+from controllers.suggest_index import suggest_index
+
+# Import middleware
+from middleware.access_log import AccessLogMiddleware
+from middleware.compression import CompressionMiddleware
+
+logger = logging.getLogger(__name__)
+
+async def prewarm_database(attempts: int = 5, delay: float = 1.0):
+    """
+    Pre-warm the connection pool and prepared statements in the background
+
+    Retries with backoff so a briefly unreachable database delays warm-up
+    instead of failing startup.
+    """
+    # Prepare the default listing (no filters, first page) on every connection
+    (count_query, page_query), count_params, page_params = list_query_params()
+    statements = [(count_query, count_params), (page_query, page_params)]
+
+    for attempt in range(1, attempts + 1):
+        try:
+            await warm_pool(statements=statements)
+            logger.info("Connection pool and statements pre-warmed")
+            return
+        except Exception as e:
+            logger.warning("Pool warm-up attempt %d/%d failed: %s", attempt, attempts, e)
+            if attempt == attempts:
+                break
+            await asyncio.sleep(delay * 2 ** (attempt - 1))
+    logger.error("Pool warm-up gave up; connections will be opened on demand")
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -20,23 +58,67 @@ async def lifespan(app: FastAPI):
     Application lifespan manager
     Handles startup and shutdown events
     """
-    # Startup
-    print("🚀 Starting Books API...")
-    print(f"📊 Environment: {settings.APP_ENV}")
-    print(f"🔗 Database: {settings.DB_HOST}:{settings.DB_PORT}/{settings.DB_NAME}")
+    # Startup: route logging through the queue (no-op when the launcher
+    # already did); importing main starts no threads
+    setup_logging()
+    logger.info(
+        "Starting Books API",
+        extra={
+            "environment": settings.APP_ENV,
+            "database": f"{settings.DB_HOST}:{settings.DB_PORT}/{settings.DB_NAME}",
+        }
+    )
+    
+    if not settings.uses_database:
+        logger.info("Using the in-memory book repository; database services are not started")
+    elif settings.auto_migrate:
+        try:
+            # Create tables if they don't exist
+            await create_tables()
+            logger.info("Database tables verified")
+        except Exception:
+            logger.exception("Database connection failed")
+            # Don't raise here to allow API to start (useful for health checks)
+    else:
+        logger.info("Skipping schema DDL (run `python scripts/migrate.py`)")
     
-    try:
-        # Create tables if they don't exist
-        await create_tables()
-        print("✅ Database tables verified")
-    except Exception as e:
-        print(f"❌ Database connection failed: {e}")
-        # Don't raise here to allow API to start (useful for health checks)
+    # Warm up off the startup path so the server accepts requests immediately
+    warmup_task = None
+    if settings.uses_database and settings.DB_POOL_PREWARM:
+        warmup_task = asyncio.create_task(prewarm_database())
+    
+    # Load the in-memory catalog and follow changes
+    if settings.uses_database and settings.CATALOG_SNAPSHOT_ENABLED:
+        from controllers.catalog_snapshot import catalog_snapshot
+        catalog_snapshot.start()
+    
+    # Drop cached lists when other workers write (LISTEN CATALOG_NOTIFY_CHANNEL)
+    if settings.uses_database and settings.LIST_CACHE_ENABLED:
+        list_cache.start()
+    
+    # Build the typeahead prefix index
+    if settings.uses_database and settings.SUGGEST_INDEX_ENABLED:
+        suggest_index.start()
+    
+    # Periodically move old soft-deleted books to libros_archive
+    archive_task = None
+    if settings.uses_database and settings.ARCHIVE_ENABLED:
+        from controllers.archive_controller import ArchiveController
+        archive_task = asyncio.create_task(ArchiveController.run_archival_loop())
     
     yield
     
-    # Shutdown
-    print("🛑 Shutting down Books API...")
+    # Shutdown (uvicorn has already drained in-flight requests)
+    logger.info("Shutting down Books API")
+    for task in (warmup_task, archive_task):
+        if task and not task.done():
+            task.cancel()
+    await book_create_batcher.stop()
+    if settings.uses_database and settings.CATALOG_SNAPSHOT_ENABLED:
+        await catalog_snapshot.stop()
+    await suggest_index.stop()
+    await list_cache.stop()
+    await dispose_engine()
 
 # Create FastAPI application
 app = FastAPI(
@@ -57,9 +139,17 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress large responses (gzip, plus brotli/zstd when installed)
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware)
+
+# Outermost: request ids and sampled access logs (timing includes compression)
+app.add_middleware(AccessLogMiddleware)
+
 # Include routers
 app.include_router(health_router)
 app.include_router(books_router)
+app.include_router(users_router)
 
 # Root endpoint
 @app.get("/", tags=["Root"])
@@ -77,17 +167,21 @@ async def read_root():
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request, exc):
     """Global HTTP exception handler"""
-    return exc.detail if isinstance(exc.detail, dict) else {
+    content = exc.detail if isinstance(exc.detail, dict) else {
         "success": False,
         "error": exc.detail,
         "code": exc.status_code
     }
+    if exc.status_code >= 500:
+        # Routes turn failures into 500s; keep the cause in the request's logs
+        logger.error(
+            "%s %s failed: %s", request.method, request.url.path, content.get("error"),
+            extra={"status": exc.status_code}
+        )
+    return JSONResponse(status_code=exc.status_code, content=content, headers=exc.headers)
 
 if __name__ == "__main__":
-    uvicorn.run(
-        "main:app",
-        host="0.0.0.0",
-        port=settings.APP_PORT,
-        reload=settings.is_development,
-        log_level="info" if settings.is_development else "warning"
-    )
\ No newline at end of file
+    from config.server import run
+
+    # `python main.py --production` forces multi-worker mode outside APP_ENV=production
+    run(production="--production" in sys.argv)
@@ -0,0 +1,90 @@
+"""
+Access log middleware with request-id correlation and sampling
+"""
+import logging
+import random
+import time
+import uuid
+from typing import Optional
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from config.log_config import RequestContext, access_logger, request_context
+from config.settings import settings
+
+REQUEST_ID_HEADER = "x-request-id"
+
+
+def _incoming_request_id(scope: Scope) -> Optional[str]:
+    """Reuse a caller/proxy supplied request id when it looks sane"""
+    for name, value in scope["headers"]:
+        if name == REQUEST_ID_HEADER.encode():
+            if 0 < len(value) <= 128 and value.isascii() and value.decode().isprintable():
+                return value.decode()
+            return None
+    return None
+
+
+class AccessLogMiddleware:
+    """
+    ASGI middleware that logs one structured line per request
+
+    Each request gets an id (X-Request-ID is honoured and echoed back) that
+    every log record emitted while serving it carries. Successful, fast
+    requests are logged with probability LOG_ACCESS_SAMPLE_RATE; 4xx/5xx
+    responses, unhandled errors and requests slower than LOG_SLOW_REQUEST_MS
+    are always logged.
+    """
+
+    def __init__(self, app: ASGIApp, sample_rate: Optional[float] = None):
+        self.app = app
+        self.sample_rate = settings.LOG_ACCESS_SAMPLE_RATE if sample_rate is None else sample_rate
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = _incoming_request_id(scope) or uuid.uuid4().hex
+        context = RequestContext(request_id, sampled=random.random() < self.sample_rate)
+        token = request_context.set(context)
+        status = 500
+        start = time.perf_counter()
+
+        async def send_with_request_id(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                MutableHeaders(scope=message).append("X-Request-ID", request_id)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            duration_ms = (time.perf_counter() - start) * 1000
+            slow = duration_ms >= settings.LOG_SLOW_REQUEST_MS
+            if status >= 400 or slow or context.sampled:
+                if status >= 500:
+                    level = logging.ERROR
+                elif status >= 400 or slow:
+                    level = logging.WARNING
+                else:
+                    level = logging.INFO
+                access_logger.log(
+                    level,
+                    "%s %s %d",
+                    scope["method"], scope["path"], status,
+                    extra={
+                        "method": scope["method"],
+                        "path": scope["path"],
+                        "query": scope["query_string"].decode("latin-1"),
+                        "status": status,
+                        "duration_ms": round(duration_ms, 2),
+                        "slow": slow,
+                        "db_queries": context.db_queries,
+                        "db_time_ms": round(context.db_time_ms, 2),
+                        "client": scope["client"][0] if scope.get("client") else None,
+                    }
+                )
+            request_context.reset(token)
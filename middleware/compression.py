@@ -0,0 +1,241 @@
+"""
+Response compression middleware with content negotiation
+"""
+import zlib
+from typing import Optional, Dict, List
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from config.settings import settings
+
+# Optional encoders: brotli and zstd are only offered when installed
+try:
+    import brotli
+except ImportError:  # pragma: no cover - depends on environment
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - depends on environment
+    zstandard = None
+
+# Server preference order, used to break ties between equal q-values
+ENCODING_PREFERENCE = ("br", "zstd", "gzip")
+
+# Content types that are already compressed or must not be buffered
+SKIP_CONTENT_TYPES = ("image/", "video/", "audio/", "application/zip", "text/event-stream")
+
+
+def _compressible(headers: Headers) -> bool:
+    """Whether the response's representation depends on Accept-Encoding"""
+    return not headers.get("content-type", "").startswith(SKIP_CONTENT_TYPES)
+
+
+def _add_vary_accept_encoding(headers: MutableHeaders) -> None:
+    """Add Accept-Encoding to Vary once, keeping any existing values"""
+    vary = [value.strip().lower() for value in headers.get("vary", "").split(",") if value.strip()]
+    if "accept-encoding" not in vary and "*" not in vary:
+        headers.add_vary_header("Accept-Encoding")
+
+
+def available_encodings() -> List[str]:
+    """Return the encodings supported by the installed libraries, in preference order"""
+    supported = []
+    for encoding in ENCODING_PREFERENCE:
+        if encoding == "br" and brotli is None:
+            continue
+        if encoding == "zstd" and zstandard is None:
+            continue
+        supported.append(encoding)
+    return supported
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """
+    Pick the best encoding for an Accept-Encoding header
+
+    Args:
+        accept_encoding: Raw Accept-Encoding header value
+
+    Returns:
+        Encoding name ("br", "zstd" or "gzip") or None for identity
+    """
+    if not accept_encoding:
+        return None
+
+    weights: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        parts = item.strip().split(";")
+        token = parts[0].strip().lower()
+        if not token:
+            continue
+        q = 1.0
+        for param in parts[1:]:
+            name, _, value = param.strip().partition("=")
+            if name.strip() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights[token] = q
+
+    best, best_q = None, 0.0
+    for encoding in available_encodings():
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+class _Compressor:
+    """Incremental compressor wrapping zlib, brotli or zstandard"""
+
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == "gzip":
+            # wbits=31 produces a gzip container
+            self._obj = zlib.compressobj(settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 31)
+        elif encoding == "br":
+            self._obj = brotli.Compressor(quality=settings.COMPRESSION_BROTLI_QUALITY)
+        elif encoding == "zstd":
+            self._obj = zstandard.ZstdCompressor(level=settings.COMPRESSION_ZSTD_LEVEL).compressobj()
+        else:
+            raise ValueError(f"Unsupported encoding: {encoding}")
+
+    def compress(self, data: bytes) -> bytes:
+        if self.encoding == "br":
+            return self._obj.process(data)
+        return self._obj.compress(data)
+
+    def flush(self) -> bytes:
+        if self.encoding == "br":
+            return self._obj.finish()
+        return self._obj.flush()
+
+
+def compress_body(body: bytes, encoding: str) -> bytes:
+    """
+    Compress a complete payload with the given encoding
+
+    Used by the middleware and by caches that keep pre-compressed variants.
+    """
+    compressor = _Compressor(encoding)
+    return compressor.compress(body) + compressor.flush()
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware that compresses responses according to Accept-Encoding
+
+    Responses smaller than ``minimum_size``, responses that already carry a
+    Content-Encoding (e.g. pre-compressed cache entries) and non-compressible
+    content types are passed through unchanged. Every compressible response
+    carries ``Vary: Accept-Encoding``, compressed or not, so shared caches
+    never hand an encoded body to a client that did not ask for it.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: Optional[int] = None):
+        self.app = app
+        self.minimum_size = (
+            settings.COMPRESSION_MINIMUM_SIZE if minimum_size is None else minimum_size
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding"))
+        if encoding is None:
+            async def send_with_vary(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    headers = MutableHeaders(scope=message)
+                    if _compressible(headers):
+                        _add_vary_accept_encoding(headers)
+                await send(message)
+
+            await self.app(scope, receive, send_with_vary)
+            return
+
+        responder = _CompressionResponder(self.app, encoding, self.minimum_size)
+        await responder(scope, receive, send)
+
+
+class _CompressionResponder:
+    """Per-request state for CompressionMiddleware"""
+
+    def __init__(self, app: ASGIApp, encoding: str, minimum_size: int):
+        self.app = app
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.send: Send = None
+        self.initial_message: Message = {}
+        self.started = False
+        self.passthrough = False
+        self.compressor: Optional[_Compressor] = None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.send = send
+        await self.app(scope, receive, self.send_with_compression)
+
+    async def send_with_compression(self, message: Message) -> None:
+        message_type = message["type"]
+
+        if message_type == "http.response.start":
+            # Delay the start message until we know the body size
+            self.initial_message = message
+            headers = MutableHeaders(scope=message)
+            compressible = _compressible(headers)
+            if compressible:
+                _add_vary_accept_encoding(headers)
+            self.passthrough = "content-encoding" in headers or not compressible
+            return
+
+        if message_type != "http.response.body":
+            await self.send(message)
+            return
+
+        if self.passthrough:
+            if not self.started:
+                self.started = True
+                await self.send(self.initial_message)
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if not self.started:
+            self.started = True
+            headers = MutableHeaders(raw=self.initial_message["headers"])
+
+            if not more_body:
+                # Complete body in a single message
+                if len(body) < self.minimum_size:
+                    await self.send(self.initial_message)
+                    await self.send(message)
+                    return
+                compressed = compress_body(body, self.encoding)
+                headers["Content-Encoding"] = self.encoding
+                headers["Content-Length"] = str(len(compressed))
+                message["body"] = compressed
+                await self.send(self.initial_message)
+                await self.send(message)
+                return
+
+            # Streaming body: compress chunks as they arrive
+            self.compressor = _Compressor(self.encoding)
+            headers["Content-Encoding"] = self.encoding
+            if "content-length" in headers:
+                del headers["Content-Length"]
+            await self.send(self.initial_message)
+
+        if self.compressor is None:
+            await self.send(message)
+            return
+
+        chunk = self.compressor.compress(body)
+        if not more_body:
+            chunk += self.compressor.flush()
+        await self.send({"type": "http.response.body", "body": chunk, "more_body": more_body})
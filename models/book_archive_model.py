@@ -0,0 +1,37 @@
+"""
+Archive model for soft-deleted books moved out of the 'libros' table
+"""
+from sqlalchemy import Column, String, Numeric, Text, DateTime, UUID
+from sqlalchemy.sql import func
+from config.database import Base
+
+class BookArchive(Base):
+    """
+    Archived book representing the 'libros_archive' table
+
+    Rows are moved here by the archival job once a soft-deleted book is
+    older than the retention window, keeping 'libros' and its indexes small.
+    """
+    __tablename__ = "libros_archive"
+    
+    id_libro = Column(
+        UUID(as_uuid=False),
+        primary_key=True,
+        comment="Identifier of the archived book"
+    )
+    name = Column(String(255), nullable=False, comment="Book title")
+    author = Column(String(255), nullable=False, comment="Book author")
+    price = Column(Numeric(10, 2), nullable=False, comment="Book price")
+    description = Column(Text, nullable=True, comment="Book description")
+    id_user = Column(UUID(as_uuid=False), nullable=True, comment="Owner user ID")
+    created_at = Column(DateTime(timezone=True), nullable=False, comment="Original creation timestamp")
+    updated_at = Column(DateTime(timezone=True), nullable=False, comment="Soft delete timestamp")
+    archived_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+        comment="Archival timestamp"
+    )
+    
+    def __repr__(self):
+        return f"<BookArchive(id_libro='{self.id_libro}', name='{self.name}')>"
@@ -1,7 +1,7 @@
 """
 Book model definition using SQLAlchemy
 """
-from sqlalchemy import Column, String, Numeric, Text, DateTime, Boolean, UUID
+from sqlalchemy import Column, String, Numeric, Text, DateTime, Boolean, UUID, Index, text
 from sqlalchemy.sql import func
 from config.database import Base
 import uuid
@@ -72,6 +72,44 @@ class Book(Base):
         comment="Last update timestamp"
     )
     
+    __table_args__ = (
+        # Owner listing: /users/{id_user}/books newest first, keyset on (created_at, id_libro)
+        Index(
+            "idx_libros_user_created_at",
+            "id_user", created_at.desc(), id_libro.desc(),
+            postgresql_where=text("NOT is_deleted")
+        ),
+        # /books/suggest fallback: lower(col) LIKE 'prefix%' needs text_pattern_ops
+        Index(
+            "idx_libros_name_prefix",
+            func.lower(name).label("name_lower"),
+            postgresql_ops={"name_lower": "text_pattern_ops"},
+            postgresql_where=text("NOT is_deleted")
+        ),
+        Index(
+            "idx_libros_author_prefix",
+            func.lower(author).label("author_lower"),
+            postgresql_ops={"author_lower": "text_pattern_ops"},
+            postgresql_where=text("NOT is_deleted")
+        ),
+        # One index per list sort (book_queries.SORTS), ending in id_libro so
+        # keyset cursors are a range scan; descending sorts scan backwards
+        *(
+            Index(
+                f"idx_libros_sort_{column}",
+                column, "id_libro",
+                postgresql_where=text("NOT is_deleted")
+            )
+            for column in ("created_at", "updated_at", "price", "name", "author")
+        ),
+        # Candidates for the archival job (soft-deleted rows by deletion time)
+        Index(
+            "idx_libros_deleted_updated_at",
+            "updated_at",
+            postgresql_where=text("is_deleted")
+        ),
+    )
+    
     def __repr__(self):
         return f"<Book(id_libro='{self.id_libro}', name='{self.name}', author='{self.author}')>"
     
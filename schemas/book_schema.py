@@ -1,9 +1,10 @@
 """
 Pydantic schemas for Book validation and serialization
 """
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field, ConfigDict, field_validator, model_validator
 from typing import Optional
 from datetime import datetime
+from enum import Enum
 from decimal import Decimal
 
 class BookBase(BaseModel):
@@ -44,6 +45,87 @@ class BookUpdate(BaseModel):
         }
     )
 
+class BookSort(str, Enum):
+    """Whitelisted list orders (each backed by an index, ties broken by id_libro)"""
+    created_at = "created_at"       # newest first (default)
+    updated_at = "updated_at"       # most recently updated first
+    price_asc = "price_asc"
+    price_desc = "price_desc"
+    name = "name"
+    author = "author"
+    relevance = "relevance"         # requires q: title matches first
+
+class BookFilter(BaseModel):
+    """Schema for the get_books filter set, used to target bulk operations"""
+    q: Optional[str] = Field(None, description="Search query (name, author, description)")
+    author: Optional[str] = Field(None, description="Filter by author")
+    min_price: Optional[Decimal] = Field(None, ge=0, description="Minimum price filter")
+    max_price: Optional[Decimal] = Field(None, ge=0, description="Maximum price filter")
+    
+    @field_validator("q", "author")
+    @classmethod
+    def strip_text(cls, value: Optional[str]) -> Optional[str]:
+        # A blank pattern would match every book
+        if value is None:
+            return None
+        value = value.strip()
+        if not value:
+            raise ValueError("must not be blank")
+        return value
+    
+    @model_validator(mode="after")
+    def check_filter(self):
+        if self.q is None and self.author is None and self.min_price is None and self.max_price is None:
+            raise ValueError("filter must set at least one of q, author, min_price, max_price")
+        if self.min_price is not None and self.max_price is not None and self.min_price > self.max_price:
+            raise ValueError("min_price cannot be greater than max_price")
+        return self
+
+class BookBulkDelete(BaseModel):
+    """Schema for soft deleting books by ID list or by filter"""
+    ids: Optional[list[str]] = Field(None, min_length=1, description="Book UUIDs to target")
+    filter: Optional[BookFilter] = Field(None, description="Filters selecting the books to target")
+    dry_run: bool = Field(False, description="Only count the books that would be affected")
+    
+    @model_validator(mode="after")
+    def check_target(self):
+        if (self.ids is None) == (self.filter is None):
+            raise ValueError("Provide exactly one of 'ids' or 'filter'")
+        return self
+    
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "filter": {"author": "borges"},
+                "dry_run": True
+            }
+        }
+    )
+
+class BookBulkUpdate(BookBulkDelete):
+    """Schema for applying the same BookUpdate patch to many books"""
+    patch: BookUpdate = Field(..., description="Fields to set on every targeted book")
+    
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "filter": {"author": "cortázar", "max_price": 20},
+                "patch": {"price": 19.99},
+                "dry_run": False
+            }
+        }
+    )
+
+class BookBulkResult(BaseModel):
+    """Schema for the outcome of a bulk operation"""
+    affected: int = Field(..., description="Books changed (or that would change on dry run)")
+    dry_run: bool = Field(..., description="Whether the operation was only counted")
+
+class BookBulkResponse(BaseModel):
+    """Schema for bulk operation responses"""
+    success: bool = True
+    data: BookBulkResult
+
 class BookResponse(BookBase):
     """Schema for book responses"""
     id_libro: str = Field(..., description="Book UUID")
@@ -91,6 +173,29 @@ class BookSingleResponse(BaseModel):
     success: bool = True
     data: BookResponse
     
+class BookSuggestion(BaseModel):
+    """Schema for a single typeahead suggestion"""
+    text: str = Field(..., description="Suggested title or author")
+    type: str = Field(..., description="Suggestion kind: 'title' or 'author'")
+    count: int = Field(..., description="Number of live books matching the suggestion")
+
+class BookSuggestListResponse(BaseModel):
+    """Schema for typeahead suggestions"""
+    success: bool = True
+    data: list[BookSuggestion]
+    
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "success": True,
+                "data": [
+                    {"text": "Jorge Luis Borges", "type": "author", "count": 2},
+                    {"text": "Julio Cortázar", "type": "author", "count": 1}
+                ]
+            }
+        }
+    )
+
 class ErrorResponse(BaseModel):
     """Schema for error responses"""
     success: bool = False
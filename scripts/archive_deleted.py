@@ -0,0 +1,43 @@
+"""
+Script to archive soft-deleted books (one run, e.g. from cron)
+
+Usage:
+    python scripts/archive_deleted.py [--retention-days 30] [--batch-size 1000] [--max-batches N]
+"""
+import argparse
+import asyncio
+import sys
+import os
+
+# Add parent directory to path to import modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.database import dispose_engine
+from controllers.archive_controller import ArchiveController
+
+async def archive(args):
+    """Run the archival job once and print the report"""
+    try:
+        report = await ArchiveController.archive_deleted_books(
+            retention_days=args.retention_days,
+            batch_size=args.batch_size,
+            max_batches=args.max_batches
+        )
+    except Exception as e:
+        print(f"❌ Error during archival: {e}")
+        sys.exit(1)
+    finally:
+        await dispose_engine()
+
+    print(f"✅ Archived {report['rows']} books in {report['batches']} batches")
+    print(f"   Row data moved:   {report['bytes']:,} bytes")
+    print(f"   libros size:      {report['table_bytes_before']:,} -> {report['table_bytes_after']:,} bytes")
+    print("   (run VACUUM on libros to return the freed pages to the filesystem)")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Archive soft-deleted books")
+    parser.add_argument("--retention-days", type=int, default=None)
+    parser.add_argument("--batch-size", type=int, default=None)
+    parser.add_argument("--max-batches", type=int, default=None)
+    print("🗄 Archiving soft-deleted books...")
+    asyncio.run(archive(parser.parse_args()))
@@ -0,0 +1,118 @@
+"""
+Benchmark the HTTP layer with the in-memory repository
+
+Runs the FastAPI app in-process (no server, no database) with
+BOOK_REPOSITORY=memory and a synthetic catalog, and reports throughput and
+latency per endpoint. This isolates routing, validation, middleware and
+JSON serialization overhead from PostgreSQL.
+
+Usage:
+    python scripts/benchmark_api.py [--books 10000] [--requests 2000] [--concurrency 20]
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+# Add parent directory to path to import modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Must be set before the app and settings are imported
+os.environ["BOOK_REPOSITORY"] = "memory"
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+import httpx
+
+from main import app
+from controllers.memory_repository import memory_store
+from models.book_model import Book
+
+AUTHORS = [f"Autor {i:04d}" for i in range(2000)] + [
+    "Jorge Luis Borges", "Julio Cortázar", "Gabriel García Márquez", "Ernesto Sabato"
+]
+OWNERS = [str(uuid.uuid4()) for _ in range(50)]
+
+def synthetic_books(count: int):
+    start = datetime.now(timezone.utc) - timedelta(days=5 * 365)
+    for i in range(count):
+        created = start + timedelta(minutes=i)
+        yield Book(
+            id_libro=str(uuid.uuid4()),
+            name=f"Libro número {i}",
+            author=random.choice(AUTHORS),
+            price=Decimal(random.randint(100, 10000)) / 100,
+            description=f"Descripción del libro {i}",
+            id_user=random.choice(OWNERS),
+            is_deleted=False,
+            created_at=created,
+            updated_at=created,
+        )
+
+def scenarios(book_id: str):
+    return [
+        ("list, first page", "GET", "/api/v1/books/?limit=10", None),
+        ("list, limit 100", "GET", "/api/v1/books/?limit=100", None),
+        ("search q=borges", "GET", "/api/v1/books/?q=borges&limit=20", None),
+        ("sort price_asc", "GET", "/api/v1/books/?sort=price_asc&limit=20", None),
+        ("owner books", "GET", f"/api/v1/users/{OWNERS[0]}/books?limit=20", None),
+        ("get by id", "GET", f"/api/v1/books/{book_id}", None),
+        ("suggest", "GET", "/api/v1/books/suggest?prefix=jor", None),
+        ("create", "POST", "/api/v1/books/", {"name": "Nuevo", "author": "Autor", "price": 10}),
+    ]
+
+async def run_scenario(client: httpx.AsyncClient, method: str, url: str, body, requests: int, concurrency: int):
+    samples = []
+    remaining = requests
+
+    async def worker():
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            started = time.perf_counter()
+            response = await client.request(method, url, json=body)
+            samples.append((time.perf_counter() - started) * 1000)
+            if response.status_code >= 400:
+                raise RuntimeError(f"{method} {url} -> {response.status_code}")
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    samples.sort()
+    return {
+        "rps": len(samples) / elapsed,
+        "p50": statistics.median(samples),
+        "p99": samples[min(len(samples) - 1, int(len(samples) * 0.99))],
+    }
+
+async def run(args):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        book_id = next(iter(memory_store.books))
+        print(f"\n   {'scenario':<20} {'req/s':>10} {'p50':>10} {'p99':>10}")
+        for name, method, url, body in scenarios(book_id):
+            # Short warm-up so imports and caches do not count
+            await run_scenario(client, method, url, body, 20, 1)
+            result = await run_scenario(client, method, url, body, args.requests, args.concurrency)
+            print(f"   {name:<20} {result['rps']:10.0f} {result['p50']:7.2f} ms {result['p99']:7.2f} ms")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--books", type=int, default=10_000)
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=20)
+    args = parser.parse_args()
+
+    random.seed(42)
+    started = time.perf_counter()
+    memory_store.load(synthetic_books(args.books))
+    print(f"📚 In-memory repository: {args.books:,} books loaded in {time.perf_counter() - started:.1f} s")
+    asyncio.run(run(args))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Benchmark the in-memory catalog snapshot against the SQL path
+
+Builds a synthetic catalog, reports memory per book and per-query latency
+of the snapshot. With --sql, the same filters are also run through
+BookController.get_books against the configured database; --seed first
+inserts the synthetic catalog there, so both paths answer over the same
+rows (use a scratch database).
+
+Usage:
+    python scripts/benchmark_catalog.py [--rows 1000000] [--repeat 20] [--sql [--seed]]
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import os
+import time
+import uuid
+
+# Add parent directory to path to import modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from controllers.catalog_snapshot import CatalogData
+
+AUTHORS = [f"Autor {i:05d}" for i in range(20000)] + [
+    "Jorge Luis Borges", "Julio Cortázar", "Gabriel García Márquez", "Ernesto Sabato"
+]
+
+SCENARIOS = [
+    ("first page, no filters", {"page": 1, "limit": 10}),
+    ("page 50, no filters", {"page": 50, "limit": 20}),
+    ("author=borges", {"page": 1, "limit": 10, "author": "borges"}),
+    ("price 10-12", {"page": 1, "limit": 10, "min_price": 10, "max_price": 12}),
+    ("author=autor 1 + price 5-50", {"page": 2, "limit": 10, "author": "autor 1", "min_price": 5, "max_price": 50}),
+]
+
+def synthetic_rows(count: int):
+    start = time.time() - 5 * 365 * 86400
+    for i in range(count):
+        yield (
+            str(uuid.uuid4()),
+            f"Libro número {i}",
+            random.choice(AUTHORS),
+            round(random.uniform(1, 100), 2),
+            start + i * 60.0,
+        )
+
+def median_ms(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+async def seed_database(rows, chunk_size: int = 5000):
+    """Insert the synthetic catalog into libros"""
+    from datetime import datetime, timezone
+    from sqlalchemy import insert
+    from config.database import get_sessionmaker
+    from models.book_model import Book
+
+    async with get_sessionmaker()() as db:
+        for start in range(0, len(rows), chunk_size):
+            await db.execute(insert(Book), [
+                {
+                    "id_libro": id_libro,
+                    "name": name,
+                    "author": author,
+                    "price": price,
+                    "created_at": datetime.fromtimestamp(created, timezone.utc),
+                }
+                for id_libro, name, author, price, created in rows[start:start + chunk_size]
+            ])
+        await db.commit()
+
+async def sql_latencies(repeat: int, rows=None):
+    from config.database import get_sessionmaker, dispose_engine
+    from controllers.book_controller import BookController
+
+    if rows is not None:
+        await seed_database(rows)
+
+    results = {}
+    async with get_sessionmaker()() as db:
+        for name, params in SCENARIOS:
+            samples = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                await BookController.get_books(db, **params)
+                samples.append((time.perf_counter() - started) * 1000)
+            results[name] = statistics.median(samples)
+    await dispose_engine()
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--sql", action="store_true", help="Also time the SQL path")
+    parser.add_argument("--seed", action="store_true", help="Insert the synthetic catalog before timing SQL")
+    args = parser.parse_args()
+
+    random.seed(42)
+    rows = list(synthetic_rows(args.rows))
+    data = CatalogData()
+    started = time.perf_counter()
+    # Synthetic rows are generated in created_at order, as reload streams them
+    data.bulk_load(rows, presorted=True)
+    load_seconds = time.perf_counter() - started
+    memory = data.memory_usage()
+
+    print(f"📚 Snapshot: {memory['rows']:,} books loaded in {load_seconds:.1f} s")
+    print(f"   Memory:   {memory['total_bytes'] / 1024 / 1024:.1f} MiB ({memory['bytes_per_row']:.0f} bytes/book)")
+
+    sql = asyncio.run(sql_latencies(args.repeat, rows if args.seed else None)) if args.sql else {}
+    print(f"\n   {'scenario':<32} {'snapshot':>12} {'sql':>12}")
+    for name, params in SCENARIOS:
+        params = dict(params)
+        page, limit = params.pop("page"), params.pop("limit")
+        elapsed = median_ms(lambda: data.query(page, limit, **params), args.repeat)
+        sql_cell = f"{sql[name]:9.2f} ms" if name in sql else "         —"
+        # None: the scan would exceed CATALOG_SNAPSHOT_MAX_SCAN and the API uses SQL
+        note = "  (uses SQL)" if data.query(page, limit, **params) is None else ""
+        print(f"   {name:<32} {elapsed:9.2f} ms {sql_cell}{note}")
+
+if __name__ == "__main__":
+    main()
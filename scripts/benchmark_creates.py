@@ -0,0 +1,98 @@
+"""
+Benchmark single-book creates with and without group commit
+
+Runs bursts of concurrent creates through BookController.create_book (one
+transaction per book) and through the book_create_batcher (one transaction
+per batch) against the configured database, and reports throughput,
+latency and commits per book. Created rows are soft-deleted afterwards.
+
+Usage:
+    python scripts/benchmark_creates.py [--creates 2000] [--concurrency 50]
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import os
+import time
+
+# Add parent directory to path to import modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event, update
+from config.database import get_engine, get_sessionmaker, dispose_engine
+from controllers.book_batcher import BookCreateBatcher
+from controllers.book_controller import BookController
+from models.book_model import Book
+from schemas.book_schema import BookCreate
+
+async def run_mode(create, creates: int, concurrency: int, commits: list):
+    samples = []
+    ids = []
+    remaining = creates
+
+    async def worker(worker_id: int):
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            data = BookCreate(name=f"Benchmark {worker_id}-{remaining}", author="Benchmark", price=10)
+            started = time.perf_counter()
+            book = await create(data)
+            samples.append((time.perf_counter() - started) * 1000)
+            ids.append(book.id_libro)
+
+    commits[0] = 0
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    samples.sort()
+    return ids, {
+        "rps": len(samples) / elapsed,
+        "p50": statistics.median(samples),
+        "p99": samples[min(len(samples) - 1, int(len(samples) * 0.99))],
+        "commits_per_book": commits[0] / len(samples),
+    }
+
+async def run(args):
+    commits = [0]
+
+    @event.listens_for(get_engine().sync_engine, "commit")
+    def count_commit(conn):
+        commits[0] += 1
+
+    async def direct(data: BookCreate):
+        async with get_sessionmaker()() as db:
+            return await BookController.create_book(db, data)
+
+    batcher = BookCreateBatcher(args.window_ms, args.max_batch_size)
+    created = []
+    print(f"\n   {'mode':<14} {'creates/s':>10} {'p50':>10} {'p99':>10} {'commits/book':>13}")
+    try:
+        for name, create in (("per-book", direct), ("group commit", batcher.submit)):
+            ids, result = await run_mode(create, args.creates, args.concurrency, commits)
+            created.extend(ids)
+            print(
+                f"   {name:<14} {result['rps']:10.0f} {result['p50']:7.2f} ms "
+                f"{result['p99']:7.2f} ms {result['commits_per_book']:13.3f}"
+            )
+    finally:
+        await batcher.stop()
+        # Leave the catalog as it was (soft delete, like the API)
+        async with get_sessionmaker()() as db:
+            await db.execute(update(Book).where(Book.id_libro.in_(created)).values(is_deleted=True))
+            await db.commit()
+        await dispose_engine()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--creates", type=int, default=2000, help="Creates per mode")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--window-ms", type=float, default=5)
+    parser.add_argument("--max-batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    print(f"📝 {args.creates:,} creates per mode, {args.concurrency} concurrent clients")
+    asyncio.run(run(args))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+-- Publish every change to "libros" on the CATALOG_NOTIFY_CHANNEL channel
+--
+-- Lets each API process keep its in-memory catalog snapshot
+-- (CATALOG_SNAPSHOT_ENABLED=true) current, and drop its cached list
+-- responses (LIST_CACHE_ENABLED=true), on writes made by other processes.
+-- The payload carries only the snapshot columns, well below the 8000-byte
+-- NOTIFY limit.
+--
+-- The channel is the trigger's argument and must match CATALOG_NOTIFY_CHANNEL
+-- (default "libros_changes"); pass another one with -v channel=...:
+--
+--   psql "$DATABASE_URL" -f scripts/catalog_notify.sql
+--   psql "$DATABASE_URL" -v channel=my_channel -f scripts/catalog_notify.sql
+--
+-- scripts/partition_libros.sql re-creates the trigger, with its channel, on
+-- the partitioned table; re-run this script only to change the channel.
+
+\if :{?channel}
+\else
+  \set channel libros_changes
+\endif
+
+CREATE OR REPLACE FUNCTION "notify_libros_change"() RETURNS trigger AS $$
+DECLARE
+  "book" RECORD;
+BEGIN
+  IF TG_OP = 'DELETE' THEN
+    "book" := OLD;
+  ELSE
+    "book" := NEW;
+  END IF;
+
+  PERFORM pg_notify(coalesce(TG_ARGV[0], 'libros_changes'), json_build_object(
+    'op', TG_OP,
+    'id_libro', "book"."id_libro",
+    'name', "book"."name",
+    'author', "book"."author",
+    'price', "book"."price",
+    'created_at', extract(epoch from "book"."created_at"),
+    'is_deleted', "book"."is_deleted"
+  )::text);
+
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS "trg_libros_notify" ON "libros";
+CREATE TRIGGER "trg_libros_notify"
+  AFTER INSERT OR UPDATE OR DELETE ON "libros"
+  FOR EACH ROW EXECUTE FUNCTION "notify_libros_change"(:'channel');
@@ -34,6 +34,32 @@ CREATE INDEX IF NOT EXISTS "idx_libros_author" ON "libros"("author");
 CREATE INDEX IF NOT EXISTS "idx_libros_price" ON "libros"("price");
 CREATE INDEX IF NOT EXISTS "idx_libros_is_deleted" ON "libros"("is_deleted");
 CREATE INDEX IF NOT EXISTS "idx_libros_created_at" ON "libros"("created_at");
+-- Prefix search for /books/suggest (LIKE 'abc%' on lower-cased values)
+CREATE INDEX IF NOT EXISTS "idx_libros_name_prefix" ON "libros"(lower("name") text_pattern_ops) WHERE NOT "is_deleted";
+CREATE INDEX IF NOT EXISTS "idx_libros_author_prefix" ON "libros"(lower("author") text_pattern_ops) WHERE NOT "is_deleted";
+-- Owner listing (/users/{id_user}/books): newest first, keyset on (created_at, id_libro)
+CREATE INDEX IF NOT EXISTS "idx_libros_user_created_at" ON "libros"("id_user", "created_at" DESC, "id_libro" DESC) WHERE NOT "is_deleted";
+-- List sorts (?sort=): one live-row index per order, id_libro as unique tiebreaker
+CREATE INDEX IF NOT EXISTS "idx_libros_sort_created_at" ON "libros"("created_at", "id_libro") WHERE NOT "is_deleted";
+CREATE INDEX IF NOT EXISTS "idx_libros_sort_updated_at" ON "libros"("updated_at", "id_libro") WHERE NOT "is_deleted";
+CREATE INDEX IF NOT EXISTS "idx_libros_sort_price" ON "libros"("price", "id_libro") WHERE NOT "is_deleted";
+CREATE INDEX IF NOT EXISTS "idx_libros_sort_name" ON "libros"("name", "id_libro") WHERE NOT "is_deleted";
+CREATE INDEX IF NOT EXISTS "idx_libros_sort_author" ON "libros"("author", "id_libro") WHERE NOT "is_deleted";
+-- Candidates for the archival job (soft-deleted rows by deletion time)
+CREATE INDEX IF NOT EXISTS "idx_libros_deleted_updated_at" ON "libros"("updated_at") WHERE "is_deleted";
+
+-- Archive of soft-deleted books past the retention window
+CREATE TABLE IF NOT EXISTS "libros_archive" (
+  "id_libro" UUID PRIMARY KEY,
+  "name" VARCHAR(255) NOT NULL,
+  "author" VARCHAR(255) NOT NULL,
+  "price" NUMERIC(10,2) NOT NULL,
+  "description" TEXT,
+  "id_user" UUID,
+  "created_at" TIMESTAMPTZ NOT NULL,
+  "updated_at" TIMESTAMPTZ NOT NULL,
+  "archived_at" TIMESTAMPTZ NOT NULL DEFAULT now()
+);
 
 -- Insert sample data
 INSERT INTO "usuarios" ("username", "email") VALUES
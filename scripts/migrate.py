@@ -0,0 +1,26 @@
+"""
+Script to apply the database schema (replaces DDL on application startup)
+"""
+import asyncio
+import sys
+import os
+
+# Add parent directory to path to import modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.database import create_tables, dispose_engine
+
+async def migrate():
+    """Create missing tables and indexes"""
+    try:
+        await create_tables()
+        print("✅ Schema is up to date")
+    except Exception as e:
+        print(f"❌ Error during migration: {e}")
+        sys.exit(1)
+    finally:
+        await dispose_engine()
+
+if __name__ == "__main__":
+    print("🛠 Applying database schema...")
+    asyncio.run(migrate())
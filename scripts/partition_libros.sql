@@ -0,0 +1,98 @@
+-- Optional: convert "libros" into a table LIST-partitioned by "is_deleted"
+--
+-- Live rows go to "libros_live" and soft-deleted rows to "libros_deleted".
+-- Every query in BookController filters on is_deleted = false, so the planner
+-- prunes "libros_deleted" and hot queries and their indexes only touch live
+-- rows. Soft deleting a book (UPDATE ... SET is_deleted = true) moves the row
+-- to the deleted partition automatically (PostgreSQL 11+), and the archival
+-- job (scripts/archive_deleted.py) then empties that partition in batches.
+--
+-- Partitioned tables require the partition key in the primary key, so the
+-- constraint becomes (id_libro, is_deleted). id_libro values are UUIDs, so
+-- they remain unique in practice.
+--
+-- The NOTIFY trigger from scripts/catalog_notify.sql, if installed, is
+-- re-created on the new table with the same channel.
+--
+-- Run once during a maintenance window:
+--   psql "$DATABASE_URL" -f scripts/partition_libros.sql
+
+BEGIN;
+
+LOCK TABLE "libros" IN ACCESS EXCLUSIVE MODE;
+
+ALTER TABLE "libros" RENAME TO "libros_unpartitioned";
+
+CREATE TABLE "libros" (
+  "id_libro" UUID NOT NULL DEFAULT gen_random_uuid(),
+  "name" VARCHAR(255) NOT NULL,
+  "author" VARCHAR(255) NOT NULL,
+  "price" NUMERIC(10,2) NOT NULL,
+  "description" TEXT,
+  "created_at" TIMESTAMP DEFAULT now(),
+  "updated_at" TIMESTAMP DEFAULT now(),
+  "id_user" UUID,
+  "is_deleted" BOOLEAN NOT NULL DEFAULT false,
+  PRIMARY KEY ("id_libro", "is_deleted"),
+  CONSTRAINT "fk_libros_usuario_part"
+    FOREIGN KEY ("id_user")
+    REFERENCES "usuarios"("id_user")
+    ON DELETE SET NULL
+) PARTITION BY LIST ("is_deleted");
+
+CREATE TABLE "libros_live" PARTITION OF "libros" FOR VALUES IN (false);
+CREATE TABLE "libros_deleted" PARTITION OF "libros" FOR VALUES IN (true);
+
+INSERT INTO "libros"
+  ("id_libro", "name", "author", "price", "description", "created_at", "updated_at", "id_user", "is_deleted")
+SELECT "id_libro", "name", "author", "price", "description", "created_at", "updated_at", "id_user", coalesce("is_deleted", false)
+FROM "libros_unpartitioned";
+
+-- Keep the NOTIFY trigger (scripts/catalog_notify.sql): it would be dropped
+-- with the old table, and other workers' snapshots and list caches would stop
+-- seeing writes. Created after the copy so the copy sends no notifications.
+DO $$
+DECLARE
+  "channel" TEXT;
+BEGIN
+  SELECT coalesce(nullif(split_part(encode("tgargs", 'escape'), '\000', 1), ''), 'libros_changes')
+  INTO "channel"
+  FROM "pg_trigger"
+  WHERE "tgrelid" = '"libros_unpartitioned"'::regclass AND "tgname" = 'trg_libros_notify';
+
+  IF FOUND THEN
+    EXECUTE format(
+      'CREATE TRIGGER "trg_libros_notify" AFTER INSERT OR UPDATE OR DELETE ON "libros" '
+      'FOR EACH ROW EXECUTE FUNCTION "notify_libros_change"(%L)',
+      "channel"
+    );
+  END IF;
+END;
+$$;
+
+DROP TABLE "libros_unpartitioned";
+
+-- Rebuild the indexes declared on the Book model (they were dropped with
+-- the old table). They are created on the partitioned table under the
+-- model's names, so create_tables / scripts/migrate.py find them; each
+-- partition gets its own copy, and the live-row (WHERE NOT is_deleted)
+-- indexes stay empty on "libros_deleted" (and the archival one on
+-- "libros_live").
+
+-- Typeahead fallback (/books/suggest: lower(col) LIKE 'prefix%')
+CREATE INDEX "idx_libros_name_prefix" ON "libros"(lower("name") text_pattern_ops) WHERE NOT "is_deleted";
+CREATE INDEX "idx_libros_author_prefix" ON "libros"(lower("author") text_pattern_ops) WHERE NOT "is_deleted";
+-- Owner listing (/users/{id_user}/books)
+CREATE INDEX "idx_libros_user_created_at" ON "libros"("id_user", "created_at" DESC, "id_libro" DESC) WHERE NOT "is_deleted";
+-- List sorts (?sort=), id_libro as unique tiebreaker
+CREATE INDEX "idx_libros_sort_created_at" ON "libros"("created_at", "id_libro") WHERE NOT "is_deleted";
+CREATE INDEX "idx_libros_sort_updated_at" ON "libros"("updated_at", "id_libro") WHERE NOT "is_deleted";
+CREATE INDEX "idx_libros_sort_price" ON "libros"("price", "id_libro") WHERE NOT "is_deleted";
+CREATE INDEX "idx_libros_sort_name" ON "libros"("name", "id_libro") WHERE NOT "is_deleted";
+CREATE INDEX "idx_libros_sort_author" ON "libros"("author", "id_libro") WHERE NOT "is_deleted";
+-- Archival candidates (soft-deleted rows by deletion time)
+CREATE INDEX "idx_libros_deleted_updated_at" ON "libros"("updated_at") WHERE "is_deleted";
+
+COMMIT;
+
+ANALYZE "libros";
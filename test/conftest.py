@@ -0,0 +1,99 @@
+"""
+Shared fixtures: the API on the in-memory repository
+
+Settings are read at import time, so the environment is set before main is
+imported. No database or other external service is needed.
+"""
+import os
+import random
+import sys
+import uuid
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+os.environ["BOOK_REPOSITORY"] = "memory"
+os.environ["LIST_CACHE_ENABLED"] = "false"
+os.environ["BOOK_CREATE_BATCHING"] = "false"
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+# Add parent directory to path to import modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from fastapi.testclient import TestClient
+
+from main import app
+from controllers.book_queries import SORTS
+from controllers.list_cache import list_cache
+from controllers.memory_repository import memory_store
+from models.book_model import Book
+
+OWNER_A = "6f1c2a4e-8d0b-4c5e-9a7f-1b2c3d4e5f60"
+OWNER_B = "0a9b8c7d-6e5f-4a3b-8c2d-1e0f9a8b7c6d"
+
+# name, author, price, description, owner, is_deleted
+CATALOG = [
+    ("Ficciones", "Jorge Luis Borges", "15.00", "Cuentos fantásticos", OWNER_A, False),
+    ("El Aleph", "Jorge Luis Borges", "18.50", None, OWNER_A, False),
+    ("Borges y yo", "Edwin Williamson", "25.00", "Biografía", OWNER_B, False),
+    ("Rayuela", "Julio Cortázar", "22.50", "Una novela experimental única.", OWNER_B, False),
+    ("Bestiario", "Julio Cortázar", "15.00", None, None, False),
+    ("Cien años de soledad", "Gabriel García Márquez", "30.00", "Realismo mágico", OWNER_B, False),
+    ("El túnel", "Ernesto Sabato", "12.00", "Prólogo sobre Borges", None, False),
+    ("Ofertas 50% y más", "Varios_Autores", "5.00", None, None, False),
+    ("Antología", "VariosXAutores", "5.00", None, None, False),
+    ("Libro borrado", "Jorge Luis Borges", "9.99", None, OWNER_A, True),
+]
+
+def build_catalog() -> list:
+    """Fresh Book objects for CATALOG with fixed ids and timestamps"""
+    rng = random.Random(39)
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    books = []
+    for i, (name, author, price, description, owner, deleted) in enumerate(CATALOG):
+        # Pairs of books share created_at so the id tiebreaker is exercised
+        created_at = start + timedelta(hours=i // 2)
+        books.append(Book(
+            id_libro=str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+            name=name,
+            author=author,
+            price=Decimal(price),
+            description=description,
+            id_user=owner,
+            is_deleted=deleted,
+            created_at=created_at,
+            updated_at=created_at + timedelta(minutes=len(CATALOG) - i)
+        ))
+    return books
+
+def expected_ids(books, sort: str) -> list:
+    """Live book ids in `sort` order (sort fields, then id_libro as a uuid)"""
+    fields, descending = SORTS[sort]
+    live = [book for book in books if not book.is_deleted]
+    live.sort(
+        key=lambda book: (*(getattr(book, field) for field in fields), uuid.UUID(book.id_libro)),
+        reverse=descending
+    )
+    return [book.id_libro for book in live]
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(app) as test_client:
+        yield test_client
+
+@pytest.fixture(autouse=True)
+def empty_store():
+    memory_store.clear()
+    list_cache.invalidate()
+    yield
+    memory_store.clear()
+
+@pytest.fixture
+def catalog():
+    books = build_catalog()
+    memory_store.load(books)
+    return books
+
+@pytest.fixture
+def by_name(catalog):
+    return {book.name: book for book in catalog}
@@ -0,0 +1,85 @@
+"""
+List filters: search, author, owner, price range and input validation
+"""
+import pytest
+
+from conftest import OWNER_A, OWNER_B
+
+def names(response) -> set:
+    assert response.status_code == 200, response.text
+    return {book["name"] for book in response.json()["data"]}
+
+def test_list_without_filters_returns_live_books(client, catalog):
+    response = client.get("/api/v1/books/", params={"limit": 100})
+    body = response.json()
+    assert names(response) == {book.name for book in catalog if not book.is_deleted}
+    assert body["pagination"]["total"] == 9
+    assert body["pagination"]["total_pages"] == 1
+
+@pytest.mark.parametrize("q, expected", [
+    # name, author and description, case insensitive
+    ("borges", {"Ficciones", "El Aleph", "Borges y yo", "El túnel"}),
+    ("RAYUELA", {"Rayuela"}),
+    ("experimental", {"Rayuela"}),
+    # LIKE wildcards in the input are matched literally
+    ("50%", {"Ofertas 50% y más"}),
+    ("%", {"Ofertas 50% y más"}),
+    ("varios_", {"Ofertas 50% y más"}),
+    ("no existe", set()),
+])
+def test_search(client, catalog, q, expected):
+    response = client.get("/api/v1/books/", params={"q": q, "limit": 100})
+    assert names(response) == expected
+    assert response.json()["pagination"]["total"] == len(expected)
+
+def test_author_filter_is_a_substring_match(client, catalog):
+    response = client.get("/api/v1/books/", params={"author": "cortázar"})
+    assert names(response) == {"Rayuela", "Bestiario"}
+
+def test_author_filter_ignores_description(client, catalog):
+    response = client.get("/api/v1/books/", params={"author": "borges"})
+    assert names(response) == {"Ficciones", "El Aleph"}
+
+@pytest.mark.parametrize("params, expected", [
+    ({"min_price": 20}, {"Borges y yo", "Rayuela", "Cien años de soledad"}),
+    ({"max_price": 12}, {"El túnel", "Ofertas 50% y más", "Antología"}),
+    # Bounds are inclusive
+    ({"min_price": 15, "max_price": 18.5}, {"Ficciones", "Bestiario", "El Aleph"}),
+])
+def test_price_range(client, catalog, params, expected):
+    response = client.get("/api/v1/books/", params={**params, "limit": 100})
+    assert names(response) == expected
+
+def test_owner_filter(client, catalog):
+    response = client.get("/api/v1/books/", params={"id_user": OWNER_A})
+    assert names(response) == {"Ficciones", "El Aleph"}
+
+def test_filters_combine(client, catalog):
+    response = client.get("/api/v1/books/", params={"q": "borges", "id_user": OWNER_B, "max_price": 30})
+    assert names(response) == {"Borges y yo"}
+
+def test_user_books_route(client, catalog):
+    response = client.get(f"/api/v1/users/{OWNER_B}/books")
+    assert names(response) == {"Borges y yo", "Rayuela", "Cien años de soledad"}
+
+def test_min_price_above_max_price_is_rejected(client, catalog):
+    response = client.get("/api/v1/books/", params={"min_price": 20, "max_price": 10})
+    assert response.status_code == 400
+    assert response.json()["error"] == "min_price cannot be greater than max_price"
+
+@pytest.mark.parametrize("params", [
+    {"min_price": -1},
+    {"limit": 0},
+    {"limit": 101},
+    {"page": 0},
+    {"id_user": "not-a-uuid"},
+    {"sort": "random"},
+])
+def test_invalid_query_parameters(client, params):
+    response = client.get("/api/v1/books/", params=params)
+    assert response.status_code == 422
+
+def test_suggest(client, catalog):
+    response = client.get("/api/v1/books/suggest", params={"prefix": "jul"})
+    assert response.status_code == 200
+    assert response.json()["data"] == [{"text": "Julio Cortázar", "type": "author", "count": 2}]
@@ -0,0 +1,131 @@
+"""
+Sort orders, offset pagination and keyset cursors
+"""
+import pytest
+
+from conftest import OWNER_B, expected_ids
+from controllers.book_queries import SORTS
+
+LIST_SORTS = [sort for sort in SORTS if sort != "relevance"]
+
+def ids(response) -> list:
+    assert response.status_code == 200, response.text
+    return [book["id_libro"] for book in response.json()["data"]]
+
+def offset_pages(client, url: str, limit: int, **params) -> list:
+    pages = []
+    page = 1
+    while True:
+        response = client.get(url, params={**params, "page": page, "limit": limit})
+        pages.append(ids(response))
+        if page >= response.json()["pagination"]["total_pages"]:
+            return pages
+        page += 1
+
+def cursor_pages(client, url: str, limit: int, **params) -> list:
+    # The first page is a plain offset request; its next_cursor starts the chain
+    pages = []
+    response = client.get(url, params={**params, "limit": limit})
+    while True:
+        pages.append(ids(response))
+        next_cursor = response.json()["pagination"]["next_cursor"]
+        if next_cursor is None:
+            return pages
+        response = client.get(url, params={**params, "limit": limit, "cursor": next_cursor})
+        assert response.json()["pagination"]["page"] is None
+
+@pytest.mark.parametrize("sort", LIST_SORTS)
+def test_sort_order(client, catalog, sort):
+    response = client.get("/api/v1/books/", params={"sort": sort, "limit": 100})
+    assert ids(response) == expected_ids(catalog, sort)
+
+def test_default_sort_is_newest_first(client, catalog):
+    assert ids(client.get("/api/v1/books/", params={"limit": 100})) == expected_ids(catalog, "created_at")
+
+def test_relevance_ranks_title_matches_first(client, catalog):
+    response = client.get("/api/v1/books/", params={"q": "borges", "sort": "relevance"})
+    # Title (3), then author (2), then description (1)
+    ranked = [book["name"] for book in response.json()["data"]]
+    assert ranked[0] == "Borges y yo"
+    assert set(ranked[1:3]) == {"Ficciones", "El Aleph"}
+    assert ranked[3] == "El túnel"
+
+def test_relevance_requires_q(client, catalog):
+    response = client.get("/api/v1/books/", params={"sort": "relevance"})
+    assert response.status_code == 400
+
+@pytest.mark.parametrize("sort", LIST_SORTS)
+@pytest.mark.parametrize("limit", [1, 2, 4])
+def test_offset_and_cursor_pages_match(client, catalog, sort, limit):
+    offset = offset_pages(client, "/api/v1/books/", limit, sort=sort)
+    cursor = cursor_pages(client, "/api/v1/books/", limit, sort=sort)
+    assert offset == cursor
+    assert [book_id for page in offset for book_id in page] == expected_ids(catalog, sort)
+
+@pytest.mark.parametrize("params", [
+    {"q": "borges", "sort": "relevance"},
+    {"q": "borges", "sort": "name"},
+    {"author": "cortázar", "sort": "price_asc"},
+    {"min_price": 10, "max_price": 25, "sort": "price_desc"},
+])
+def test_offset_and_cursor_pages_match_with_filters(client, catalog, params):
+    offset = offset_pages(client, "/api/v1/books/", 2, **params)
+    cursor = cursor_pages(client, "/api/v1/books/", 2, **params)
+    assert offset == cursor
+    assert sum(len(page) for page in offset) == client.get(
+        "/api/v1/books/", params=params
+    ).json()["pagination"]["total"]
+
+def test_user_books_cursor_pages(client, catalog):
+    url = f"/api/v1/users/{OWNER_B}/books"
+    assert offset_pages(client, url, 1, include_total=True) == cursor_pages(client, url, 1)
+
+def test_user_books_skip_the_count_unless_asked(client, catalog):
+    url = f"/api/v1/users/{OWNER_B}/books"
+    pagination = client.get(url, params={"limit": 2}).json()["pagination"]
+    assert pagination["page"] == 1
+    assert pagination["total"] is None and pagination["total_pages"] is None
+    assert pagination["next_cursor"] is not None
+
+    last = client.get(url, params={"limit": 2, "page": 2}).json()
+    assert len(last["data"]) == 1
+    assert last["pagination"]["next_cursor"] is None
+
+    pagination = client.get(url, params={"limit": 2, "include_total": True}).json()["pagination"]
+    assert pagination["total"] == 3 and pagination["total_pages"] == 2
+
+def test_offset_pagination_metadata(client, catalog):
+    response = client.get("/api/v1/books/", params={"page": 3, "limit": 4})
+    pagination = response.json()["pagination"]
+    assert len(response.json()["data"]) == 1
+    assert pagination == {
+        "page": 3, "limit": 4, "total": 9, "total_pages": 3, "next_cursor": None
+    }
+
+def test_page_past_the_end_is_empty(client, catalog):
+    response = client.get("/api/v1/books/", params={"page": 5, "limit": 4})
+    assert response.status_code == 200
+    assert response.json()["data"] == []
+
+def test_cursor_skips_books_deleted_between_pages(client, catalog):
+    first = client.get("/api/v1/books/", params={"sort": "name", "limit": 3}).json()
+    remaining = expected_ids(catalog, "name")[3:]
+    assert client.delete(f"/api/v1/books/{remaining[0]}").status_code == 200
+
+    response = client.get(
+        "/api/v1/books/",
+        params={"sort": "name", "limit": 100, "cursor": first["pagination"]["next_cursor"]}
+    )
+    assert ids(response) == remaining[1:]
+
+def test_cursor_from_another_sort_is_rejected(client, catalog):
+    first = client.get("/api/v1/books/", params={"sort": "name", "limit": 2}).json()
+    response = client.get(
+        "/api/v1/books/",
+        params={"sort": "price_asc", "cursor": first["pagination"]["next_cursor"]}
+    )
+    assert response.status_code == 400
+
+def test_malformed_cursor_is_rejected(client, catalog):
+    response = client.get("/api/v1/books/", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
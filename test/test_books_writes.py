@@ -0,0 +1,137 @@
+"""
+Single-book writes, soft delete and the bulk endpoints
+"""
+import pytest
+
+from conftest import OWNER_A
+
+def live_names(client, **params) -> set:
+    response = client.get("/api/v1/books/", params={**params, "limit": 100})
+    assert response.status_code == 200, response.text
+    return {book["name"] for book in response.json()["data"]}
+
+def test_create_get_update(client):
+    response = client.post("/api/v1/books/", json={
+        "name": "Pedro Páramo", "author": "Juan Rulfo", "price": 14.255, "id_user": OWNER_A
+    })
+    assert response.status_code == 201
+    book = response.json()["data"]
+    # NUMERIC(10,2) rounding
+    assert book["price"] == "14.26"
+    assert book["id_user"] == OWNER_A
+
+    response = client.put(f"/api/v1/books/{book['id_libro']}", json={"price": 16})
+    assert response.status_code == 200
+    updated = response.json()["data"]
+    assert updated["price"] == "16.00"
+    assert updated["name"] == "Pedro Páramo"
+    assert updated["updated_at"] >= book["updated_at"]
+
+    response = client.get(f"/api/v1/books/{book['id_libro']}")
+    assert response.json()["data"]["price"] == "16.00"
+    assert live_names(client, author="rulfo") == {"Pedro Páramo"}
+
+@pytest.mark.parametrize("body", [
+    {"author": "Juan Rulfo", "price": 10},
+    {"name": "", "author": "Juan Rulfo", "price": 10},
+    {"name": "Pedro Páramo", "author": "Juan Rulfo", "price": 0},
+])
+def test_create_validation(client, body):
+    assert client.post("/api/v1/books/", json=body).status_code == 422
+
+def test_unknown_book_is_not_found(client, catalog):
+    missing = "00000000-0000-4000-8000-000000000000"
+    assert client.get(f"/api/v1/books/{missing}").status_code == 404
+    assert client.put(f"/api/v1/books/{missing}", json={"price": 10}).status_code == 404
+    assert client.delete(f"/api/v1/books/{missing}").status_code == 404
+
+def test_soft_delete_hides_the_book(client, by_name):
+    book = by_name["Rayuela"]
+    response = client.delete(f"/api/v1/books/{book.id_libro}")
+    assert response.status_code == 200
+    assert response.json()["message"] == "Book deleted successfully"
+
+    # The row stays, flagged, but every read path treats it as gone
+    assert book.is_deleted
+    assert client.get(f"/api/v1/books/{book.id_libro}").status_code == 404
+    assert client.put(f"/api/v1/books/{book.id_libro}", json={"price": 10}).status_code == 404
+    assert client.delete(f"/api/v1/books/{book.id_libro}").status_code == 404
+    assert "Rayuela" not in live_names(client)
+    assert live_names(client, q="rayuela") == set()
+    suggestions = client.get("/api/v1/books/suggest", params={"prefix": "ray"}).json()["data"]
+    assert suggestions == []
+
+def test_seeded_deleted_book_is_hidden(client, by_name):
+    book = by_name["Libro borrado"]
+    assert client.get(f"/api/v1/books/{book.id_libro}").status_code == 404
+    assert "Libro borrado" not in live_names(client, author="borges")
+
+def test_bulk_update_by_ids(client, by_name):
+    ids = [by_name["Ficciones"].id_libro, by_name["El Aleph"].id_libro, by_name["Libro borrado"].id_libro]
+    response = client.post("/api/v1/books/bulk/update", json={"ids": ids, "patch": {"price": 11}})
+    assert response.status_code == 200
+    # Deleted books are not targeted
+    assert response.json()["data"] == {"affected": 2, "dry_run": False}
+    assert live_names(client, min_price=11, max_price=11) == {"Ficciones", "El Aleph"}
+    assert by_name["Libro borrado"].price != 11
+
+def test_bulk_update_by_filter(client, catalog):
+    response = client.post("/api/v1/books/bulk/update", json={
+        "filter": {"author": "cortázar", "max_price": 20}, "patch": {"price": 19.99}
+    })
+    assert response.json()["data"] == {"affected": 1, "dry_run": False}
+    assert live_names(client, min_price=19.99, max_price=19.99) == {"Bestiario"}
+
+def test_bulk_update_dry_run_changes_nothing(client, catalog):
+    before = client.get("/api/v1/books/", params={"limit": 100}).json()["data"]
+    response = client.post("/api/v1/books/bulk/update", json={
+        "filter": {"q": "borges"}, "patch": {"price": 1}, "dry_run": True
+    })
+    assert response.json()["data"] == {"affected": 4, "dry_run": True}
+    assert client.get("/api/v1/books/", params={"limit": 100}).json()["data"] == before
+
+def test_bulk_delete_by_filter(client, catalog):
+    response = client.post("/api/v1/books/bulk/delete", json={"filter": {"q": "borges"}})
+    assert response.json()["data"] == {"affected": 4, "dry_run": False}
+    assert live_names(client, q="borges") == set()
+    assert client.get("/api/v1/books/").json()["pagination"]["total"] == 5
+
+def test_bulk_delete_by_ids_dry_run(client, by_name):
+    ids = [by_name["Rayuela"].id_libro, by_name["Rayuela"].id_libro]
+    response = client.post("/api/v1/books/bulk/delete", json={"ids": ids, "dry_run": True})
+    # Duplicate ids count once
+    assert response.json()["data"] == {"affected": 1, "dry_run": True}
+    assert "Rayuela" in live_names(client)
+
+@pytest.mark.parametrize("url, extra", [
+    ("/api/v1/books/bulk/update", {"patch": {"price": 1}}),
+    ("/api/v1/books/bulk/delete", {}),
+])
+@pytest.mark.parametrize("target", [
+    # A filter without criteria would select the whole catalog
+    {"filter": {}},
+    {"filter": {"q": ""}},
+    {"filter": {"q": "   "}},
+    {"filter": {"author": ""}},
+    {"filter": {"q": None, "author": None}},
+    # Exactly one of ids or filter
+    {},
+    {"ids": [], "filter": {"q": "borges"}},
+    {"ids": []},
+])
+def test_bulk_requires_a_selective_target(client, catalog, url, extra, target):
+    response = client.post(url, json={**target, **extra})
+    assert response.status_code == 422, response.text
+    assert client.get("/api/v1/books/").json()["pagination"]["total"] == 9
+    assert not any(book.price == 1 for book in catalog)
+
+def test_bulk_update_requires_a_patch(client, catalog):
+    response = client.post("/api/v1/books/bulk/update", json={"filter": {"q": "borges"}, "patch": {}})
+    assert response.status_code == 400
+
+def test_writes_invalidate_cached_lists(client, catalog, monkeypatch):
+    monkeypatch.setattr("config.settings.settings.LIST_CACHE_ENABLED", True)
+    assert "Ficciones" in live_names(client)
+    assert "Ficciones" in live_names(client)
+    client.post("/api/v1/books/bulk/delete", json={"filter": {"author": "borges"}})
+    assert "Ficciones" not in live_names(client)
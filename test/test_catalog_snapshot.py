@@ -0,0 +1,78 @@
+"""
+CatalogData filters and pages against a brute-force reference
+"""
+import random
+import uuid
+
+import pytest
+
+from controllers.catalog_snapshot import CatalogData
+
+AUTHORS = [f"Autor {i:03d}" for i in range(50)] + ["Jorge Luis Borges", "Julio Cortázar"]
+
+def order_key(row):
+    return row[4], uuid.UUID(row[0]).bytes
+
+@pytest.fixture(scope="module")
+def snapshot():
+    """A loaded CatalogData plus the live rows it should hold after some writes"""
+    rng = random.Random(32)
+    rows = [
+        (str(uuid.UUID(int=rng.getrandbits(128), version=4)), f"Libro {i}",
+         rng.choice(AUTHORS), round(rng.uniform(1, 100), 2), 1000.0 + i // 3)
+        for i in range(3000)
+    ]
+    rows.sort(key=order_key)
+    data = CatalogData()
+    data.bulk_load(rows, presorted=True)
+
+    live = {row[0]: row for row in rows}
+    deleted = {}
+    for _ in range(800):
+        action = rng.random()
+        if action < 0.3 and live:
+            id_libro = rng.choice(sorted(live))
+            deleted[id_libro] = live.pop(id_libro)
+            data.remove(id_libro)
+        elif action < 0.5 and deleted:
+            # Revived with new values
+            id_libro = rng.choice(sorted(deleted))
+            old = deleted.pop(id_libro)
+            live[id_libro] = (id_libro, old[1], rng.choice(AUTHORS), round(rng.uniform(1, 100), 2), old[4])
+            data.upsert(*live[id_libro])
+        elif action < 0.8:
+            id_libro = rng.choice(sorted(live))
+            old = live[id_libro]
+            live[id_libro] = (id_libro, old[1], rng.choice(AUTHORS), round(rng.uniform(1, 100), 2), old[4])
+            data.upsert(*live[id_libro])
+        else:
+            # New books, mostly out of created_at order
+            row = (str(uuid.uuid4()), "Nuevo", rng.choice(AUTHORS),
+                   round(rng.uniform(1, 100), 2), rng.choice([500.0, 1500.0, 2000.0]))
+            live[row[0]] = row
+            data.upsert(*row)
+    return data, list(live.values())
+
+@pytest.mark.parametrize("author", [None, "autor", "autor 01", "BORGES", "nadie"])
+@pytest.mark.parametrize("min_price, max_price", [(None, None), (10, 12), (None, 50), (5, None), (0, 100)])
+@pytest.mark.parametrize("page, limit", [(1, 10), (3, 7), (40, 50), (500, 10)])
+def test_query_matches_reference(snapshot, author, min_price, max_price, page, limit):
+    data, live = snapshot
+    expected = [
+        row for row in live
+        if (not author or author.lower() in row[2].lower())
+        and (min_price is None or row[3] >= min_price)
+        and (max_price is None or row[3] <= max_price)
+    ]
+    expected.sort(key=order_key, reverse=True)
+
+    page_ids, total = data.query(page, limit, author, min_price, max_price)
+    assert total == len(expected)
+    assert page_ids == [row[0] for row in expected[(page - 1) * limit:page * limit]]
+
+def test_wide_author_and_price_scan_defers_to_sql(snapshot, monkeypatch):
+    data, _ = snapshot
+    monkeypatch.setattr("config.settings.settings.CATALOG_SNAPSHOT_MAX_SCAN", 100)
+    assert data.query(1, 10, "autor", 0, 100) is None
+    assert data.query(1, 10, "autor") is not None
+    assert data.query(1, 10, None, 0, 100) is not None
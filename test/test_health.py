@@ -0,0 +1,16 @@
+"""
+Health endpoints on the in-memory repository
+"""
+
+def test_health(client):
+    response = client.get("/api/v1/health")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["repository"] == "memory"
+    assert body["database"] == "not used"
+    assert body["log_records_dropped"] == 0
+
+def test_cache_metrics(client):
+    response = client.get("/api/v1/health/cache")
+    assert response.status_code == 200
+    assert "invalidations" in response.json()["data"]